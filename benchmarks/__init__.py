@@ -0,0 +1 @@
+"""Latency benchmarks of the StellarBurgersAPI operations (see benchmarks/runner.py)"""
@@ -0,0 +1,63 @@
+"""Benchmarked operations.
+
+Each entry prepares what the operation needs (a registered user, orders)
+on the given client and returns the call to time; the call must answer 200.
+"""
+import itertools
+
+from utils.user_data import generate_unique_user
+
+
+def _register(client):
+    user = generate_unique_user()
+    response = client.register_user(user)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to register benchmark user: {response.status_code}")
+    return user
+
+
+def register(client, ingredient_ids):
+    return client.register_user
+
+
+def login(client, ingredient_ids):
+    user = _register(client)
+    return lambda: client.login_user(user["email"], user["password"])
+
+
+def get_user(client, ingredient_ids):
+    _register(client)
+    return client.get_user_info
+
+
+def update_user(client, ingredient_ids):
+    _register(client)
+    names = itertools.count()
+    return lambda: client.update_user({"name": f"Bench {next(names)}"})
+
+
+def ingredients(client, ingredient_ids):
+    return client.get_ingredients
+
+
+def create_order(client, ingredient_ids):
+    _register(client)
+    return lambda: client.create_order(ingredient_ids)
+
+
+def list_orders(client, ingredient_ids):
+    _register(client)
+    for _ in range(10):
+        client.create_order(ingredient_ids)
+    return client.get_user_orders
+
+
+OPERATIONS = {
+    "register": register,
+    "login": login,
+    "get_user": get_user,
+    "update_user": update_user,
+    "ingredients": ingredients,
+    "create_order": create_order,
+    "list_orders": list_orders,
+}
@@ -0,0 +1,197 @@
+"""Latency benchmarks with a run history and regression check.
+
+Every operation of benchmarks/operations.py is called --repeat times after
+--warmup untimed calls. Results (min/median/p95/mean in ms) are appended to
+a JSON-lines history per target ("stand-in" or the base URL) and compared
+with the median of the last --baseline-runs runs of the same target. A
+metric regresses when it is both --threshold (relative) and --min-delta-ms
+(absolute) slower than its baseline; --on-regression decides whether that
+warns or fails the run (exit code 1).
+
+Examples:
+    python -m benchmarks.runner --stand-in
+    python -m benchmarks.runner --base-url https://stellarburgers.nomoreparties.site --repeat 10
+    python -m benchmarks.runner --stand-in --threshold 0.1 --on-regression fail
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.operations import OPERATIONS
+from utils.api_client import StellarBurgersAPI
+from utils.load_test import percentile
+from utils.settings import get_settings
+
+
+METRICS = ("median_ms", "p95_ms")  # compared against the baseline
+
+
+def summarize(samples, errors=0):
+    """Summary of call durations in seconds"""
+    ordered = sorted(samples)
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "samples": len(ordered),
+        "errors": errors,
+        "min_ms": ms(ordered[0] if ordered else None),
+        "median_ms": ms(statistics.median(ordered) if ordered else None),
+        "p95_ms": ms(percentile(ordered, 95)),
+        "mean_ms": ms(statistics.fmean(ordered) if ordered else None),
+    }
+
+
+class BenchmarkSuite:
+    """Time each operation over repeated calls"""
+
+    def __init__(self, client, operations=None, repeat=30, warmup=3):
+        self.client = client
+        self.operations = operations or OPERATIONS
+        self.repeat = repeat
+        self.warmup = warmup
+        self.cleanup_errors = []
+
+    def _client(self):
+        client = StellarBurgersAPI(base_url=self.client.urls.base_url, transport=self.client.session)
+        client.hooks = []  # nothing but the call itself is timed
+        return client
+
+    def run_operation(self, name, ingredient_ids):
+        client = self._client()
+        try:
+            call = self.operations[name](client, ingredient_ids)
+            for _ in range(self.warmup):
+                call()
+            samples, errors = [], 0
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                response = call()
+                samples.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+            return summarize(samples, errors)
+        finally:
+            self.cleanup_errors.extend(client.cleanup_users())
+
+    def run(self):
+        """Return {operation: summary}"""
+        catalogue = self.client.get_ingredient_catalogue()
+        ingredient_ids = [catalogue.buns[0]["_id"], catalogue.mains[0]["_id"]]
+        return {name: self.run_operation(name, ingredient_ids) for name in self.operations}
+
+
+class History:
+    """JSON-lines file of benchmark runs"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def runs(self, target=None):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as history:
+            runs = [json.loads(line) for line in history if line.strip()]
+        return [run for run in runs if target is None or run["target"] == target]
+
+    def append(self, run):
+        with open(self.path, "a", encoding="utf-8") as history:
+            history.write(json.dumps(run, ensure_ascii=False) + "\n")
+
+    def baseline(self, target, runs=5):
+        """Per operation and metric, the median over the last runs of target"""
+        recent = self.runs(target)[-runs:] if runs > 0 else []
+        baseline = {}
+        for run in recent:
+            for name, summary in run["results"].items():
+                for metric in METRICS:
+                    if summary.get(metric) is not None:
+                        baseline.setdefault(name, {}).setdefault(metric, []).append(summary[metric])
+        return {
+            name: {metric: statistics.median(values) for metric, values in metrics.items()}
+            for name, metrics in baseline.items()
+        }
+
+
+def compare(baseline, results, threshold=0.25, min_delta_ms=1.0):
+    """Return the regressions of results against baseline as messages"""
+    regressions = []
+    for name, summary in results.items():
+        for metric in METRICS:
+            previous = baseline.get(name, {}).get(metric)
+            current = summary.get(metric)
+            if previous is None or current is None:
+                continue
+            if current > previous * (1 + threshold) and current - previous >= min_delta_ms:
+                regressions.append(
+                    f"{name} {metric}: {current:.2f} ms vs baseline {previous:.2f} ms "
+                    f"(+{(current / previous - 1) if previous else float('inf'):.0%})"
+                )
+    return regressions
+
+
+def format_results(results, baseline):
+    lines = [f"{'operation':<14}{'samples':>8}{'errors':>8}{'min ms':>10}{'median ms':>11}{'p95 ms':>10}{'baseline':>10}"]
+    for name, summary in results.items():
+        previous = baseline.get(name, {}).get("median_ms")
+        lines.append(
+            f"{name:<14}{summary['samples']:>8}{summary['errors']:>8}{summary['min_ms']!s:>10}"
+            f"{summary['median_ms']!s:>11}{summary['p95_ms']!s:>10}"
+            f"{'-' if previous is None else round(previous, 3)!s:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Stellar Burgers API operations")
+    parser.add_argument("--base-url", help="defaults to STELLAR_BURGERS_BASE_URL")
+    parser.add_argument("--stand-in", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--operation", action="append", choices=list(OPERATIONS),
+                        help="benchmark only this operation (repeatable)")
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per operation")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls per operation")
+    parser.add_argument("--history", default="benchmark-history.jsonl", help="JSON-lines run history")
+    parser.add_argument("--baseline-runs", type=int, default=5, help="previous runs the baseline is the median of")
+    parser.add_argument("--threshold", type=float, default=0.25, help="relative slowdown counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--on-regression", choices=("warn", "fail"), default="warn")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args(argv)
+
+    from utils.stand_in import StandInServer
+    server = StandInServer().start() if args.stand_in else None
+    try:
+        base_url = server.url if server else args.base_url or get_settings().base_url
+        client = StellarBurgersAPI(base_url=base_url)
+        operations = {name: OPERATIONS[name] for name in args.operation} if args.operation else None
+        suite = BenchmarkSuite(client, operations, repeat=args.repeat, warmup=args.warmup)
+        results = suite.run()
+    finally:
+        if server:
+            server.stop()
+
+    target = "stand-in" if args.stand_in else base_url
+    history = History(args.history)
+    baseline = history.baseline(target, args.baseline_runs)
+    regressions = compare(baseline, results, args.threshold, args.min_delta_ms)
+    if not args.no_record:
+        history.append({"timestamp": int(time.time()), "target": target, "repeat": args.repeat, "results": results})
+
+    print(f"Benchmarks against {target}")
+    print(format_results(results, baseline))
+    if suite.cleanup_errors:
+        print(f"Cleanup warnings: {suite.cleanup_errors}")
+    if not regressions:
+        return 0
+    print("Regressions:")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1 if args.on_regression == "fail" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,52 @@
+import os
+import re
+
 import pytest
+import pytest_asyncio
+# Only modules that load no HTTP stack: requests is imported with the first
+# StellarBurgersAPI, httpx with the first async client (see --startup-profile)
 from utils.api_client import StellarBurgersAPI
+from utils.cassette import use_cassette
+from utils.data_factory import DataFactory
+from utils.settings import get_settings
+from utils.user_pool import UserPool
+
+
+# Options, settings, the stand-in, xdist and the end-of-run reports
+pytest_plugins = ["utils.pytest_plugin"]
+
+
+def _cassette_path(settings, *parts):
+    names = [re.sub(r"[^\w.-]+", "_", part).strip("_") for part in parts]
+    return os.path.join(settings.cassette_dir, *names[:-1], names[-1] + ".json")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def session_cassette(pytestconfig):
+    """Record/replay the calls made outside tests: session fixtures, user pool teardown"""
+    settings = get_settings()
+    if settings.cassettes == "off":
+        yield None
+        return
+    if settings.cassettes != "replay" and hasattr(pytestconfig, "workerinput"):
+        # Every worker would register the same seeded users
+        pytest.exit("Record cassettes without -n; replaying them in parallel is fine", returncode=4)
+    with use_cassette(_cassette_path(settings, "session"), settings.cassettes, "session") as cassette:
+        yield cassette
+
+
+@pytest.fixture(autouse=True)
+def cassette(request, session_cassette):
+    """Record/replay the calls of each test in its own cassette file"""
+    if session_cassette is None:
+        yield None
+        return
+    settings = get_settings()
+    nodeid = request.node.nodeid
+    module, _, name = nodeid.partition("::")
+    path = _cassette_path(settings, os.path.splitext(os.path.basename(module))[0], name.replace("::", "."))
+    with use_cassette(path, settings.cassettes, nodeid) as test_cassette:
+        yield test_cassette
 
 
 @pytest.fixture(scope="function")
@@ -11,24 +58,79 @@ def api_client():
     client.cleanup_users()
 
 
+@pytest_asyncio.fixture
+async def async_api_client(cassette):
+    """Provide an asyncio API client; forks share its pool and are cleaned up with it"""
+    if cassette is not None and cassette.mode == "replay":
+        pytest.skip("the async client is not recorded in cassettes")
+    from utils.async_api_client import AsyncStellarBurgersAPI
+    async with AsyncStellarBurgersAPI() as client:
+        yield client
+        await client.cleanup_users()
+
+
+@pytest.fixture(scope="session")
+def session_api_client():
+    """Provide one API client for session-wide setup, sharing its connections"""
+    client = StellarBurgersAPI()
+    yield client
+    client.cleanup_users()
+
+
+@pytest.fixture(scope="session")
+def user_pool(session_api_client):
+    """Registered users shared by the whole session, deleted in bulk at the end"""
+    pool = UserPool(session_api_client)
+    pool.fill(1)  # register while no test cassette is active
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def authenticated_user(user_pool):
+    """Provide a client logged in as a pooled user; the profile must not be changed"""
+    with user_pool.lease() as client:
+        yield client
+
+
 @pytest.fixture(scope="function")
-def authenticated_user(api_client):
-    """Provide an authenticated user for tests that need one"""
+def fresh_user(api_client):
+    """Provide a newly registered user for tests that change the profile"""
     register_resp = api_client.register_user()
     if register_resp.status_code != 200:
         pytest.fail(f"Failed to create test user: {register_resp.status_code}")
     return api_client
 
 
+@pytest.fixture(scope="session")
+def ingredient_catalogue(session_api_client):
+    """Provide the ingredient catalogue, fetched once per session"""
+    try:
+        return session_api_client.get_ingredient_catalogue()
+    except Exception as e:
+        pytest.fail(f"Failed to fetch ingredients for test setup: {e}")
+
+
+@pytest.fixture(scope="session")
+def data_factory(pytestconfig):
+    """Provide a seeded factory for users with order history; everything it creates is deleted at the end"""
+    factory = DataFactory(seed=pytestconfig.getoption("dataset_seed"))
+    yield factory
+    factory.cleanup()
+
+
+@pytest.fixture(scope="session")
+def order_history(data_factory, pytestconfig):
+    """Provide users that each already have an order history (see --dataset-users/--dataset-orders)"""
+    try:
+        return data_factory.provision(
+            pytestconfig.getoption("dataset_users"), pytestconfig.getoption("dataset_orders")
+        )
+    except Exception as e:
+        pytest.fail(f"Failed to provision order history: {e}")
+
+
 @pytest.fixture(scope="function")
-def ingredient_ids(api_client):
-    """Provide a list of valid ingredient IDs for testing"""
-    ingredients_resp = api_client.get_ingredients()
-    if ingredients_resp.status_code != 200:
-        pytest.fail("Failed to fetch ingredients for test setup")
-    
-    ingredients_data = ingredients_resp.json()
-    if not ingredients_data.get("success"):
-        pytest.fail("Ingredients API returned success=false")
-    
-    return [item["_id"] for item in ingredients_data["data"]][:2]
\ No newline at end of file
+def ingredient_ids(ingredient_catalogue):
+    """Provide a list of valid ingredient IDs for testing: a bun and a filling"""
+    return [ingredient_catalogue.buns[0]["_id"], ingredient_catalogue.mains[0]["_id"]]
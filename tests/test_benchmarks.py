@@ -0,0 +1,48 @@
+import allure
+
+from benchmarks.runner import BenchmarkSuite, History, compare
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Benchmarks")
+class TestBenchmarks:
+
+    @allure.title("Every benchmarked operation succeeds")
+    @allure.description(
+        "A short benchmark run times each operation without errors or leaked users."
+    )
+    def test_short_benchmark_run(self, api_client):
+        with allure.step("Run every operation twice"):
+            suite = BenchmarkSuite(api_client, repeat=2, warmup=0)
+            results = suite.run()
+
+        with allure.step("Verify the summaries"):
+            assert set(results) == {"register", "login", "get_user", "update_user",
+                                    "ingredients", "create_order", "list_orders"}
+            for name, summary in results.items():
+                assert summary["samples"] == 2 and summary["errors"] == 0, f"{name}: {summary}"
+                assert summary["min_ms"] <= summary["median_ms"] <= summary["p95_ms"]
+            assert suite.cleanup_errors == []
+
+    @allure.title("Regressions are measured against the recent history")
+    @allure.description(
+        "The baseline is the median of the last runs of the same target; only slowdowns past "
+        "both the relative threshold and the absolute floor count."
+    )
+    def test_regression_against_history(self, tmp_path):
+        history = History(str(tmp_path / "history.jsonl"))
+        with allure.step("Record three runs on the stand-in and one on another target"):
+            for median in (10.0, 12.0, 30.0):
+                history.append({"target": "stand-in", "results": {"login": {"median_ms": median, "p95_ms": 20.0}}})
+            history.append({"target": "https://example.test", "results": {"login": {"median_ms": 1.0}}})
+
+        with allure.step("Compare new results with the baseline"):
+            baseline = history.baseline("stand-in", runs=3)
+            assert baseline == {"login": {"median_ms": 12.0, "p95_ms": 20.0}}
+            assert compare(baseline, {"login": {"median_ms": 14.0, "p95_ms": 20.5}}, threshold=0.25) == []
+            assert compare(baseline, {"login": {"median_ms": 16.0, "p95_ms": 20.5}}, threshold=0.25) == [
+                "login median_ms: 16.00 ms vs baseline 12.00 ms (+33%)"
+            ]
+            # Past the relative threshold but under the absolute floor
+            assert compare(baseline, {"login": {"median_ms": 16.0}}, threshold=0.25, min_delta_ms=5.0) == []
+            assert history.baseline("nowhere") == {}
@@ -0,0 +1,43 @@
+import allure
+import pytest
+
+from utils.api_client import StellarBurgersAPI
+from utils.cassette import use_cassette
+from utils.user_data import set_user_namespace, user_namespace
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Record/Replay")
+class TestCassette:
+
+    @allure.title("A recording replays under another user namespace")
+    @allure.description(
+        "Every recording registers fresh emails; replays match them and see their own namespace in responses."
+    )
+    def test_replay_in_other_namespace(self, cassette, tmp_path):
+        if cassette is not None and cassette.mode == "replay":
+            pytest.skip("records against the service under test")
+        from utils.transport import CassetteSession
+        path = str(tmp_path / "namespaced.json")
+        previous = user_namespace().rstrip("_")
+        try:
+            with allure.step("Record a registration in one namespace"):
+                set_user_namespace("recorded")
+                with use_cassette(path, "record", "seed"):
+                    client = StellarBurgersAPI(transport=CassetteSession(timeout=10))
+                    assert client.register_user().status_code == 200
+                    recorded_email = client.get_user_info().json()["user"]["email"]
+                    assert client.cleanup_users() == []
+                assert "_recorded_" in recorded_email
+
+            with allure.step("Replay it in another namespace"):
+                set_user_namespace("replayed")
+                with use_cassette(path, "replay", "seed"):
+                    client = StellarBurgersAPI(transport=CassetteSession(timeout=10))
+                    assert client.register_user().status_code == 200
+                    email = client.created_users[0].email
+                    assert client.get_user_info().json()["user"]["email"] == email
+                    assert email == recorded_email.replace("_recorded_", "_replayed_")
+                    assert client.cleanup_users() == []
+        finally:
+            set_user_namespace(previous)
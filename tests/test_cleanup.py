@@ -0,0 +1,155 @@
+import os
+import subprocess
+import sys
+import time
+
+import allure
+
+from utils.api_client import StellarBurgersAPI
+from utils.background_cleanup import BackgroundCleanup
+from utils.leak_ledger import LeakLedger
+from utils.user_data import TrackedUser
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Test Data Cleanup")
+class TestCleanup:
+
+    @allure.title("Cleanup deletes registered users, even after an email change")
+    @allure.description(
+        "cleanup_users reuses registration tokens, so users whose email changed are still deleted."
+    )
+    def test_cleanup_deletes_users(self, api_client):
+        with allure.step("Register users and change the email of one"):
+            users = []
+            for _ in range(3):
+                response = api_client.register_user()
+                assert response.status_code == 200, "Registration should succeed"
+                tracked = api_client.created_users[-1]
+                users.append({"email": tracked.email, "password": tracked.password})
+            new_email = f"changed_{users[-1]['email']}"
+            assert api_client.update_user({"email": new_email}).status_code == 200
+            users[-1]["email"] = new_email
+
+        with allure.step("Tokens and tracking follow the new email"):
+            assert api_client.current_user == new_email
+            assert api_client.created_users[-1].email == new_email
+            assert api_client.as_user(new_email).get_user_info().status_code == 200
+
+        with allure.step("Clean up and verify nobody can log in"):
+            assert api_client.cleanup_users() == []
+            login_api = StellarBurgersAPI()
+            for user in users:
+                response = login_api.login_user(user["email"], user["password"])
+                assert response.status_code == 401, f"User {user['email']} was not deleted"
+
+    @allure.title("Cleanup renews stale tokens instead of logging in")
+    @allure.description(
+        "Each cleanup worker renews the expired access token of its user with the refresh token."
+    )
+    def test_cleanup_renews_stale_tokens(self, api_client, monkeypatch):
+        with allure.step("Register users and let their access tokens run out"):
+            for _ in range(3):
+                assert api_client.register_user().status_code == 200, "Registration should succeed"
+            users = list(api_client.created_users)
+            for user in users:
+                api_client.tokens.get(user.email).expires_at = 0
+
+        with allure.step("Clean up without a single login"):
+            urls = []
+            request = api_client.request
+
+            def recording_request(method, url, **kwargs):
+                urls.append(url)
+                return request(method, url, **kwargs)
+
+            monkeypatch.setattr(api_client, "request", recording_request)
+            assert api_client.cleanup_users() == []
+            assert api_client.urls.login not in urls
+            assert urls.count(api_client.urls.token) == 3
+            assert api_client.tokens.identities() == []
+
+    @allure.title("A user deleted by the test is not cleaned up again")
+    @allure.description(
+        "delete_user stops tracking the deleted user, so cleanup reports no failure for it."
+    )
+    def test_deleted_user_is_untracked(self, api_client):
+        with allure.step("Register two users and delete the current one"):
+            assert api_client.register_user().status_code == 200, "Registration should succeed"
+            assert api_client.register_user().status_code == 200, "Registration should succeed"
+            first, deleted = api_client.created_users
+            assert api_client.delete_user().status_code in [200, 202]
+
+        with allure.step("Clean up without failures"):
+            assert api_client.created_users == [first]
+            assert api_client.cleanup_users() == []
+
+    @allure.title("Stale users are deleted incrementally while the client is in use")
+    @allure.description(
+        "Background cleanup deletes tracked users in batches and keeps the user the client acts as."
+    )
+    def test_background_cleanup(self, api_client):
+        with allure.step("Register three users; the last one stays current"):
+            for _ in range(3):
+                assert api_client.register_user().status_code == 200, "Registration should succeed"
+            first, second, current = api_client.created_users
+
+        with allure.step("Delete stale users one batch at a time"):
+            cleanup = BackgroundCleanup(api_client, max_age=0, batch_size=1)
+            assert cleanup.run_once() == 1
+            assert cleanup.run_once() == 1
+            assert cleanup.run_once() == 0
+            assert (cleanup.deleted, cleanup.failed) == (2, 0)
+            assert api_client.created_users == [current]
+            for user in (first, second):
+                assert StellarBurgersAPI().login_user(user.email, user.password).status_code == 401
+
+        with allure.step("The background thread picks up users once the client moves on"):
+            api_client.auth_token = None
+            with BackgroundCleanup(api_client, max_age=0, interval=0.01) as cleanup:
+                deadline = time.monotonic() + 5
+                while api_client.created_users and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            assert api_client.created_users == [] and cleanup.deleted == 1
+
+    @allure.title("Leaked users are purged by the ledger sweep")
+    @allure.description(
+        "Users recorded in the leak ledger are deleted on the next sweep and removed from the ledger."
+    )
+    def test_leak_ledger_sweep(self, api_client, tmp_path):
+        with allure.step("Register a user and record it as leaked"):
+            response = api_client.register_user()
+            assert response.status_code == 200, "Registration should succeed"
+            user = api_client.created_users.pop()
+            ledger = LeakLedger(str(tmp_path / "leaked-users.jsonl"))
+            ledger.record(api_client.urls.base_url, user, "simulated leak")
+            ledger.record("https://elsewhere.invalid", user, "other service")
+
+        with allure.step("Sweep and verify the user is gone"):
+            assert ledger.sweep(StellarBurgersAPI()) == 1
+            response = StellarBurgersAPI().login_user(user.email, user.password)
+            assert response.status_code == 401, "Leaked user was not purged"
+            assert [entry["base_url"] for entry in ledger.entries()] == ["https://elsewhere.invalid"]
+
+    @allure.title("Collecting without running does not sweep the leak ledger")
+    @allure.description(
+        "--collect-only makes no API calls: leaked users are purged only by a run that has tests to run."
+    )
+    def test_collect_only_skips_sweep(self, pytestconfig, tmp_path):
+        with allure.step("Record a leaked user of an unreachable service"):
+            path = str(tmp_path / "leaked-users.jsonl")
+            LeakLedger(path).record("http://127.0.0.1:9", TrackedUser("leaked@example.com", "secret"), "simulated leak")
+            os.utime(path, (0, 0))
+
+        with allure.step("Collect the tests against that service"):
+            env = {name: value for name, value in os.environ.items() if not name.startswith("STELLAR_BURGERS_")}
+            env.update(STELLAR_BURGERS_BASE_URL="http://127.0.0.1:9", STELLAR_BURGERS_LEAK_LEDGER=path)
+            result = subprocess.run(
+                [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", "tests/test_login.py"],
+                cwd=pytestconfig.rootpath, env=env, capture_output=True, text=True,
+            )
+            assert result.returncode == 0, result.stdout + result.stderr
+
+        with allure.step("Check the ledger was left alone"):
+            assert os.stat(path).st_mtime == 0
+            assert [entry["email"] for entry in LeakLedger(path).entries()] == ["leaked@example.com"]
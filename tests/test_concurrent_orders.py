@@ -0,0 +1,67 @@
+import asyncio
+
+import allure
+import pytest
+
+from utils.user_data import generate_unique_user
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Concurrent Orders")
+class TestConcurrentOrders:
+
+    @allure.title("Many users create orders at the same time")
+    @allure.description(
+        "Orders created concurrently by several users all succeed and get distinct order numbers."
+    )
+    @pytest.mark.asyncio
+    async def test_concurrent_order_creation(self, async_api_client, ingredient_ids):
+        users = [async_api_client.fork() for _ in range(10)]
+
+        with allure.step("Register users concurrently"):
+            responses = await asyncio.gather(*(user.register_user() for user in users))
+            assert all(response.status_code == 200 for response in responses), "Registration should succeed"
+
+        with allure.step("Create five orders per user concurrently"):
+            responses = await asyncio.gather(
+                *(user.create_order(ingredient_ids) for user in users for _ in range(5))
+            )
+            assert all(response.status_code == 200 for response in responses), "Expected 200 for every order"
+            numbers = [response.json()["order"]["number"] for response in responses]
+            assert len(set(numbers)) == len(numbers), "Order numbers must be unique"
+
+        with allure.step("Every user sees their own orders"):
+            responses = await asyncio.gather(*(user.get_user_orders() for user in users))
+            assert all(len(response.json()["orders"]) == 5 for response in responses)
+
+    @allure.title("Concurrent duplicate registration (negative)")
+    @allure.description(
+        "When the same user is registered many times at once, exactly one registration succeeds."
+    )
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_registration(self, async_api_client):
+        with allure.step("Register the same user ten times concurrently"):
+            user = generate_unique_user()
+            responses = await asyncio.gather(
+                *(async_api_client.fork().register_user(user) for _ in range(10))
+            )
+            statuses = sorted(response.status_code for response in responses)
+            assert statuses == [200] + [403] * 9, f"Unexpected statuses: {statuses}"
+
+    @allure.title("Users deleted concurrently are not cleaned up again")
+    @allure.description(
+        "delete_user stops tracking the deleted user, so the async cleanup reports no failure for it."
+    )
+    @pytest.mark.asyncio
+    async def test_concurrent_delete(self, async_api_client):
+        users = [async_api_client.fork() for _ in range(5)]
+
+        with allure.step("Register users and delete them concurrently"):
+            responses = await asyncio.gather(*(user.register_user() for user in users))
+            assert all(response.status_code == 200 for response in responses), "Registration should succeed"
+            responses = await asyncio.gather(*(user.delete_user() for user in users))
+            assert all(response.status_code in [200, 202] for response in responses)
+
+        with allure.step("Clean up without failures"):
+            assert all(not user.created_users for user in users)
+            assert await async_api_client.cleanup_users() == []
@@ -0,0 +1,33 @@
+import allure
+
+from utils.data_factory import DataFactory
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Test Data Factory")
+class TestDataFactory:
+
+    @allure.title("Seeded plans are reproducible")
+    @allure.description(
+        "Two factories with the same seed plan the same users and burgers; a different seed does not."
+    )
+    def test_seeded_plan_is_reproducible(self, api_client, ingredient_catalogue):
+        with allure.step("Plan datasets from the same and from another seed"):
+            first = DataFactory(api_client, seed=7).plan(3, 4)
+            second = DataFactory(api_client, seed=7).plan(3, 4)
+            other = DataFactory(api_client, seed=8).plan(3, 4)
+
+        with allure.step("Compare the plans"):
+            assert [user.user_data for user in first] == [user.user_data for user in second]
+            assert [user.burgers for user in first] == [user.burgers for user in second]
+            assert [user.user_data for user in first] != [user.user_data for user in other]
+
+    @allure.title("Planned burgers are valid")
+    @allure.description("Every planned burger has one bun on both ends and at least one filling.")
+    def test_planned_burgers_are_valid(self, api_client, ingredient_catalogue):
+        for user in DataFactory(api_client, seed=1).plan(5, 5):
+            for burger in user.burgers:
+                assert burger[0] == burger[-1]
+                assert ingredient_catalogue.by_id(burger[0])["type"] == "bun"
+                assert all(ingredient_catalogue.by_id(item)["type"] != "bun" for item in burger[1:-1])
+                assert len(burger) >= 3
@@ -0,0 +1,74 @@
+import allure
+
+from utils.impact import MODULE, Fingerprints, fingerprint_source, unchanged
+
+
+SOURCE = '''
+import json
+
+LIMIT = 50
+
+
+class Client:
+    retries = 3
+
+    def get(self):
+        return json.dumps({})
+
+    @property
+    def token(self):
+        return None
+
+
+def helper():
+    return LIMIT
+'''
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Test Impact")
+class TestImpact:
+
+    @allure.title("Functions and module code are fingerprinted separately")
+    @allure.description(
+        "Editing a function changes only its own fingerprint; constants and class attributes "
+        "belong to the module fingerprint."
+    )
+    def test_fingerprint_granularity(self):
+        before = fingerprint_source(SOURCE)
+        assert set(before) == {"Client.get", "Client.token", "helper", MODULE}
+
+        with allure.step("Edit one method body"):
+            after = fingerprint_source(SOURCE.replace("json.dumps({})", "json.dumps([])"))
+            assert {name for name in before if before[name] != after[name]} == {"Client.get"}
+
+        with allure.step("Edit a class attribute and a constant"):
+            after = fingerprint_source(SOURCE.replace("retries = 3", "retries = 5").replace("50", "100"))
+            assert {name for name in before if before[name] != after[name]} == {MODULE}
+
+    @allure.title("A cached pass applies only while nothing it depends on changes")
+    @allure.description(
+        "The test file, the target and every recorded dependency must match the cached entry."
+    )
+    def test_cached_entry_validity(self, tmp_path):
+        (tmp_path / "utils").mkdir()
+        (tmp_path / "utils" / "client.py").write_text(SOURCE, encoding="utf-8")
+        (tmp_path / "test_client.py").write_text("def test(): pass\n", encoding="utf-8")
+        fingerprints = Fingerprints(str(tmp_path))
+        dependencies = {f"utils/client.py::{name}": fingerprints.dependency(f"utils/client.py::{name}")
+                        for name in ("helper", MODULE)}
+        entry = {
+            "outcome": "passed",
+            "target": "stand-in",
+            "file": fingerprints.file("test_client.py"),
+            "globals": fingerprints.global_files(),
+            "dependencies": dependencies,
+        }
+        with allure.step("Unchanged code reuses the result"):
+            assert unchanged(entry, fingerprints, "test_client.py", "stand-in")
+
+        with allure.step("Another target, a failure or a changed dependency reruns the test"):
+            assert not unchanged(entry, fingerprints, "test_client.py", "https://example.test")
+            assert not unchanged(dict(entry, outcome="failed"), fingerprints, "test_client.py", "stand-in")
+            (tmp_path / "utils" / "client.py").write_text(SOURCE.replace("return LIMIT", "return 0"), encoding="utf-8")
+            assert not unchanged(entry, Fingerprints(str(tmp_path)), "test_client.py", "stand-in")
@@ -0,0 +1,103 @@
+import allure
+import pytest
+
+from utils.ingredients import IngredientCache, shared_cache
+
+
+class CountingFetch:
+    """Fake ingredient fetch counting its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [
+            {"_id": "bun-1", "type": "bun"},
+            {"_id": "main-1", "type": "main"},
+            {"_id": "sauce-1", "type": "sauce"},
+        ]
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Ingredients")
+class TestIngredients:
+
+    @allure.title("Get ingredient list (positive)")
+    @allure.description(
+        "Ingredients endpoint returns the catalogue with buns, fillings and sauces."
+    )
+    def test_get_ingredients(self, api_client):
+        with allure.step("Fetch ingredients and verify response"):
+            response = api_client.get_ingredients()
+            assert response.status_code == 200, "Expected 200 OK for ingredients"
+            body = response.json()
+            assert body.get("success") is True
+            types = {item["type"] for item in body["data"]}
+            assert {"bun", "main", "sauce"} <= types, f"Unexpected ingredient types: {types}"
+
+    @allure.title("Ingredient catalogue is cached and indexed")
+    @allure.description(
+        "The catalogue is fetched once and supports lookups by _id and by type."
+    )
+    def test_ingredient_catalogue_lookups(self, api_client, ingredient_catalogue):
+        with allure.step("Reuse the session catalogue and look ingredients up"):
+            assert api_client.get_ingredient_catalogue() is ingredient_catalogue
+            bun = ingredient_catalogue.buns[0]
+            assert ingredient_catalogue.by_id(bun["_id"]) is bun
+            assert all(item["type"] == "sauce" for item in ingredient_catalogue.sauces)
+
+    @allure.title("Catalogue cache expires after its TTL")
+    @allure.description(
+        "A catalogue older than the TTL is fetched again; a fresh one is reused."
+    )
+    def test_cache_ttl_expiry(self):
+        fetch = CountingFetch()
+        cache = IngredientCache(fetch, "http://service", ttl=60)
+        with allure.step("Fetch once and reuse the fresh catalogue"):
+            catalogue = cache.get()
+            assert cache.get() is catalogue
+            assert fetch.calls == 1
+        with allure.step("Age the catalogue past the TTL"):
+            catalogue.fetched_at -= 61
+            assert cache.get() is not catalogue
+            assert fetch.calls == 2
+
+    @allure.title("Snapshot is reloaded by another cache for the same service")
+    @allure.description(
+        "A later run starts from the snapshot and does not fetch; a snapshot of another service is ignored."
+    )
+    def test_cache_snapshot(self, tmp_path):
+        path = str(tmp_path / "snapshots" / "ingredients.json")
+        with allure.step("Fetch and save a snapshot"):
+            IngredientCache(CountingFetch(), "http://service", snapshot_path=path).get()
+
+        with allure.step("Load it in a new cache without fetching"):
+            fetch = CountingFetch()
+            catalogue = IngredientCache(fetch, "http://service", snapshot_path=path).get()
+            assert fetch.calls == 0
+            assert catalogue.ids() == ["bun-1", "main-1", "sauce-1"]
+
+        with allure.step("Reject it for another base URL"):
+            fetch = CountingFetch()
+            IngredientCache(fetch, "http://other-service", snapshot_path=path).get()
+            assert fetch.calls == 1
+
+    @allure.title("Shared caches are keyed by service and snapshot path")
+    @allure.description(
+        "Another snapshot path gets its own cache, another TTL is refused and get() uses the caller's fetch."
+    )
+    def test_shared_cache_keys(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("utils.ingredients._caches", {})
+        first, second = CountingFetch(), CountingFetch()
+        path = str(tmp_path / "ingredients.json")
+        with allure.step("Look caches up by base URL and snapshot path"):
+            cache = shared_cache("http://service", first, ttl=60)
+            assert shared_cache("http://service", second, ttl=60) is cache
+            assert shared_cache("http://service", first, ttl=60, snapshot_path=path) is not cache
+        with allure.step("Refuse a different TTL for the same cache"):
+            with pytest.raises(ValueError):
+                shared_cache("http://service", first, ttl=120)
+        with allure.step("Fetch through the caller's function"):
+            cache.get(fetch=second)
+            assert (first.calls, second.calls) == (0, 1)
@@ -0,0 +1,79 @@
+import allure
+import pytest
+
+from utils.load_test import EndpointStats, LoadTest, percentile
+from utils.metrics import RequestMetrics, RequestRecord
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Load Test")
+class TestLoadTest:
+
+    @allure.title("Nearest-rank percentiles")
+    def test_percentile(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) is None
+
+    @allure.title("Long runs keep bounded request history")
+    @allure.description(
+        "Latency samples and per-test request records stay within their bounds while counters stay exact."
+    )
+    def test_bounded_history(self):
+        with allure.step("Record 10000 latencies into a 100-sample reservoir"):
+            stats = EndpointStats(samples=100)
+            for index in range(10000):
+                stats.record((index + 1) / 1000, 200)
+            summary = stats.summary(10.0)
+            assert len(stats.latencies) == 100
+            assert summary["requests"] == 10000
+            assert summary["latency_ms"]["min"] == 1.0 and summary["latency_ms"]["max"] == 10000.0
+            assert 2000 < summary["latency_ms"]["p50"] < 8000
+
+        with allure.step("Keep only the latest request records of a test"):
+            metrics = RequestMetrics(history=3)
+            for index in range(5):
+                metrics(RequestRecord("GET", "/api/ingredients", 200, 10, index))
+            assert metrics.dropped == 2
+            assert [record.elapsed for record in metrics.take_current()] == [2, 3, 4]
+            assert metrics.endpoints["GET /api/ingredients"].count == 5
+
+    @allure.title("Short load test reports per-endpoint statistics")
+    @allure.description(
+        "A short run of virtual users creates orders and reads history without errors."
+    )
+    @pytest.mark.asyncio
+    async def test_short_load_run(self, async_api_client):
+        with allure.step("Run two virtual users for a moment"):
+            report = await LoadTest(async_api_client, users=2, duration=0.2).run()
+
+        with allure.step("Verify the report"):
+            assert set(report["endpoints"]) == {"POST /api/orders", "GET /api/orders"}
+            for summary in report["endpoints"].values():
+                assert summary["requests"] > 0
+                assert summary["error_rate"] == 0.0
+                assert summary["schema_errors"] == 0
+                assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
+            assert report["cleanup_errors"] == []
+
+    @allure.title("Virtual users are deleted when the scenario fails")
+    @allure.description(
+        "A constant-rate run that raises still cleans up the users it registered."
+    )
+    @pytest.mark.asyncio
+    async def test_cleanup_after_failure(self, async_api_client, monkeypatch):
+        load_test = LoadTest(async_api_client, users=2, duration=0.2, scenario="constant", rate=20)
+
+        async def failing_iteration(user, ingredients):
+            raise RuntimeError("scenario failed")
+
+        monkeypatch.setattr(load_test, "_iteration", failing_iteration)
+        with allure.step("Run until the scenario fails"):
+            with pytest.raises(RuntimeError, match="scenario failed"):
+                await load_test.run()
+
+        with allure.step("No virtual user is left registered"):
+            assert all(not fork.created_users for fork in async_api_client._forks)
+            assert async_api_client.created_users == []
@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import allure
+import pytest
+
+from utils.metrics import RequestMetrics, RequestRecord, map_in_context
+
+
+def record(metrics, phase, method, endpoint, status, elapsed):
+    metrics.phase = phase
+    metrics(RequestRecord(method, endpoint, status, 100, elapsed))
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Request Metrics")
+class TestRequestMetrics:
+
+    @allure.title("Snapshots of several workers merge into one summary")
+    @allure.description(
+        "Merged totals add up, the slowest calls are the slowest of all workers and phase sums are kept."
+    )
+    def test_merge_snapshots(self):
+        with allure.step("Record requests in two workers"):
+            first, second = RequestMetrics(slowest=3), RequestMetrics(slowest=3)
+            record(first, "setup", "POST", "/api/auth/register", 200, 0.5)
+            record(first, "call", "GET", "/api/ingredients", 200, 0.1)
+            record(first, "call", "GET", "/api/ingredients", 500, 0.4)
+            record(second, "call", "GET", "/api/ingredients", 200, 0.2)
+            record(second, "teardown", "DELETE", "/api/auth/user", 202, 0.3)
+            record(second, "teardown", "DELETE", "/api/auth/user", 202, 0.05)
+
+        with allure.step("Merge their snapshots on the controller"):
+            controller = RequestMetrics(slowest=3)
+            controller.merge(first.snapshot())
+            controller.merge(second.snapshot())
+
+        with allure.step("Check the totals, the slowest calls and the phase sums"):
+            ingredients = controller.endpoints["GET /api/ingredients"]
+            assert (ingredients.count, ingredients.errors, ingredients.bytes) == (3, 1, 300)
+            assert ingredients.total == pytest.approx(0.7)
+            assert ingredients.max == 0.4
+            assert controller.endpoints["DELETE /api/auth/user"].count == 2
+            assert [call.elapsed for call in controller.slowest()] == [0.5, 0.4, 0.3]
+            assert controller.slowest()[0].phase == "setup"
+            assert controller.phase_totals == pytest.approx({"setup": 0.5, "call": 0.7, "teardown": 0.35})
+
+    @allure.title("The test phase does not leak into background threads")
+    @allure.description(
+        "A thread started by the test records no phase; pool calls made for the test keep its phase."
+    )
+    def test_phase_per_context(self):
+        metrics = RequestMetrics()
+        metrics.phase = "call"
+        with allure.step("Record from a background thread"):
+            thread = threading.Thread(target=metrics, args=(RequestRecord("GET", "/api/orders/all", 200, 0, 0.1),))
+            thread.start()
+            thread.join()
+            assert metrics.phase == "call"
+        with allure.step("Record from a pool working for the test"):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(map_in_context(executor, metrics, [RequestRecord("GET", "/api/orders", 200, 0, 0.2)] * 2))
+        assert metrics.phase_totals == pytest.approx({None: 0.1, "call": 0.4})
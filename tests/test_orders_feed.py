@@ -0,0 +1,68 @@
+import allure
+import pytest
+
+from utils.orders import Order, iter_feed
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Orders Feed")
+class TestOrdersFeed:
+
+    @allure.title("Get the all-orders feed (positive)")
+    @allure.description(
+        "The feed of all users lists the latest orders with total counters."
+    )
+    def test_get_all_orders(self, api_client, ingredient_ids):
+        with allure.step("Create an order without auth"):
+            number = api_client.create_order(ingredient_ids, with_auth=False).json()["order"]["number"]
+
+        with allure.step("Fetch the feed and find the order"):
+            response = api_client.get_all_orders()
+            assert response.status_code == 200, "Expected 200 OK for the orders feed"
+            body = response.json()
+            assert body.get("success") is True
+            assert number in [order["number"] for order in body["orders"]]
+            assert body["totalToday"] <= body["total"]
+
+    @allure.title("Stream the all-orders feed with a limit")
+    @allure.description(
+        "Streaming stops after limit orders and yields typed Order records."
+    )
+    def test_stream_all_orders_limit(self, api_client, ingredient_ids):
+        with allure.step("Make sure the feed has at least three orders"):
+            for _ in range(3):
+                assert api_client.create_order(ingredient_ids, with_auth=False).status_code == 200
+
+        with allure.step("Read two orders of the feed"):
+            orders = list(api_client.iter_all_orders(limit=2))
+            assert len(orders) == 2
+            assert all(isinstance(order, Order) and order.ingredients for order in orders)
+
+    @allure.title("Stream user orders without auth (negative)")
+    @allure.description(
+        "A rejected feed request raises instead of yielding an empty feed."
+    )
+    def test_stream_user_orders_without_auth(self, api_client):
+        import requests
+        with allure.step("Stream orders with an invalid token"):
+            api_client.auth_token = "Bearer invalid"
+            with pytest.raises(requests.HTTPError):
+                api_client.iter_user_orders()
+
+    @allure.title("Feed parser copes with any chunking")
+    @allure.description(
+        "Orders split across chunk boundaries, escaped strings and trailing counters are parsed alike."
+    )
+    def test_feed_parser_chunking(self):
+        body = (
+            '{"success": true, "orders": [{"_id": "a", "name": "Space \\"burger\\" к", "number": 12345},'
+            ' {"_id": "b", "number": 7}], "total": 123456, "totalToday": 0}'
+        )
+        for size in (1, 2, 5, 64):
+            with allure.step(f"Parse the body in {size}-character chunks"):
+                fields = {}
+                chunks = [body[i:i + size] for i in range(0, len(body), size)]
+                orders = list(iter_feed(chunks, fields))
+                assert [order["number"] for order in orders] == [12345, 7]
+                assert orders[0]["name"] == 'Space "burger" к'
+                assert fields == {"success": True, "total": 123456, "totalToday": 0}
@@ -1,8 +1,6 @@
-import requests
 import allure
 
 from utils.user_data import generate_unique_user
-from utils.api_urls import PASSWORD_RESET_CONFIRM_URL
 
 
 @allure.epic("Stellar Burgers API")
@@ -23,8 +21,8 @@ class TestPasswordReset:
     @allure.description("Attempt to reset password using an invalid token.")
     def test_password_reset_with_invalid_token(self, api_client):
         with allure.step("Attempt password reset with invalid token and verify error"):
-            response = requests.post(
-                PASSWORD_RESET_CONFIRM_URL,
+            response = api_client.session.post(
+                api_client.urls.password_reset_confirm,
                 json={"password": "newpass123", "token": "invalid-token-123"},
             )
             assert response.status_code in [403, 404, 500]
@@ -0,0 +1,79 @@
+import allure
+import pytest
+
+from utils.schemas import SchemaValidationError, ValidationReport, get_registry
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Response Schemas")
+class TestResponseSchemas:
+
+    @allure.title("Schema mismatches are reported with JSON paths")
+    @allure.description(
+        "Missing fields, wrong types and bad array items are reported at their exact location."
+    )
+    def test_mismatch_paths(self):
+        registry = get_registry()
+        body = {
+            "success": True,
+            "orders": [
+                {"_id": "a" * 24, "ingredients": ["b" * 24], "status": "done", "number": 1,
+                 "createdAt": "", "updatedAt": ""},
+                {"_id": "a" * 24, "ingredients": ["nope"], "status": "done", "number": "2",
+                 "createdAt": ""},
+            ],
+            "total": True,
+        }
+        with allure.step("Validate a broken orders feed"):
+            errors = registry.validate("GET", "/api/orders/all", 200, body)
+        with allure.step("Verify every problem is located"):
+            assert errors == [
+                "$.orders[1].ingredients[0]: 'nope' does not match '^[0-9a-f]{24}$'",
+                "$.orders[1].number: expected int, got str",
+                "$.orders[1].updatedAt: missing",
+                "$.total: expected int, got bool",
+                "$.totalToday: missing",
+            ]
+        with allure.step("Client errors share the error schema"):
+            assert registry.validate("POST", "/api/auth/login", 401, {"success": False, "message": "x"}) == []
+            assert registry.validate("POST", "/api/auth/login", 401, {"success": "false"}) == [
+                "$.success: expected False, got 'false'",
+                "$.message: missing",
+            ]
+
+    @allure.title("Service responses match the declared schemas")
+    @allure.description(
+        "In strict mode every response of a user's session is validated and none is rejected."
+    )
+    def test_responses_match(self, api_client, ingredient_ids, monkeypatch):
+        monkeypatch.setattr(api_client.settings, "validate_responses", "strict")
+        with allure.step("Exercise the user and order endpoints"):
+            assert api_client.register_user().status_code == 200
+            assert api_client.get_user_info().status_code == 200
+            assert api_client.create_order(ingredient_ids).status_code == 200
+            assert api_client.create_order(ingredient_ids, with_auth=False).status_code == 200
+            assert api_client.create_order([]).status_code == 400
+            assert api_client.get_user_orders().status_code == 200
+            assert api_client.request("GET", api_client.urls.orders_all).status_code == 200
+
+    @allure.title("Strict mode fails the call, warn mode reports it")
+    @allure.description(
+        "A response that breaks its schema raises SchemaValidationError or lands in the validation report."
+    )
+    def test_strict_and_warn(self, api_client, monkeypatch):
+        registry = get_registry()
+        # Pretend the catalogue schema requires a field the service does not send
+        monkeypatch.setitem(registry._validators[("GET", "/api/ingredients")], 200,
+                            lambda value, path, errors: errors.append(f"{path}.version: missing"))
+
+        with allure.step("Strict mode raises"):
+            monkeypatch.setattr(api_client.settings, "validate_responses", "strict")
+            with pytest.raises(SchemaValidationError, match=r"\$\.version: missing"):
+                api_client.get_ingredients()
+
+        with allure.step("Warn mode records the failure"):
+            monkeypatch.setattr(api_client.settings, "validate_responses", "warn")
+            report = ValidationReport()
+            monkeypatch.setattr("utils.schemas.validation_report", report)
+            assert api_client.get_ingredients().status_code == 200
+            assert report.failures == [("GET /api/ingredients", ["$.version: missing"])]
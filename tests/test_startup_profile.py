@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import allure
+
+from utils.startup_profile import ImportTimer
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Startup Profile")
+class TestStartupProfile:
+
+    @allure.title("Import timer splits total and own time of nested imports")
+    @allure.description(
+        "A module's total time includes the modules it imports, its own time does not."
+    )
+    def test_import_timer(self, tmp_path, monkeypatch):
+        with allure.step("Write a module that imports a slow one"):
+            (tmp_path / "profiled_outer.py").write_text("import profiled_inner\n")
+            (tmp_path / "profiled_inner.py").write_text("import time\ntime.sleep(0.05)\n")
+            monkeypatch.syspath_prepend(str(tmp_path))
+
+        with allure.step("Import it with the timer installed"):
+            timer = ImportTimer().install()
+            timer.phase = "collection"
+            try:
+                import profiled_outer
+            finally:
+                timer.uninstall()
+                sys.modules.pop("profiled_outer", None)
+                sys.modules.pop("profiled_inner", None)
+
+        with allure.step("Check the records and that the real loader is back on the module"):
+            outer, inner = timer.records["profiled_outer"], timer.records["profiled_inner"]
+            assert inner.own >= 0.05 and outer.total >= inner.total
+            assert outer.own < 0.05
+            assert (outer.phase, inner.phase) == ("collection", "collection")
+            assert [record.name for record in timer.slowest(2)] == ["profiled_outer", "profiled_inner"]
+            assert profiled_outer.__loader__ is profiled_outer.__spec__.loader
+            assert type(profiled_outer.__loader__).__name__ == "SourceFileLoader"
+            assert timer not in sys.meta_path
+
+    @allure.title("Collecting the tests does not load the HTTP stack")
+    @allure.description(
+        "conftest.py, its plugin and the test modules import requests and httpx only once a client is created."
+    )
+    def test_collection_is_lazy(self, pytestconfig):
+        code = (
+            "import sys, conftest, utils.pytest_plugin, pathlib, importlib\n"
+            "for path in sorted(pathlib.Path('tests').glob('test_*.py')):\n"
+            "    importlib.import_module(f'tests.{path.stem}')\n"
+            "print(sorted(name for name in ('requests', 'httpx', 'utils.stand_in') if name in sys.modules))\n"
+        )
+        with allure.step("Import conftest.py, its plugin and every test module in a fresh interpreter"):
+            result = subprocess.run(
+                [sys.executable, "-c", code], cwd=pytestconfig.rootpath, capture_output=True, text=True
+            )
+            assert result.returncode == 0, result.stderr
+            assert result.stdout.strip() == "[]"
@@ -0,0 +1,145 @@
+import socket
+
+import allure
+import pytest
+
+from utils.api_client import StellarBurgersAPI
+from utils.throttle import ServiceUnavailableError, Throttle, retry_after_seconds
+
+
+class StatusSession:
+    """Transport answering with the given status codes in turn"""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        import requests
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response._content = b"{}"
+        return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Rate Limiting")
+class TestThrottle:
+
+    @allure.title("Token bucket spaces requests and adapts to overload")
+    @allure.description(
+        "Requests beyond the burst wait for tokens; a 429 with Retry-After pauses and halves the rate."
+    )
+    def test_token_bucket(self):
+        clock = FakeClock()
+        throttle = Throttle("http://service", rate_limit=10, burst=1, clock=clock)
+        with allure.step("Three requests at once are spaced 100 ms apart"):
+            assert [round(throttle.reserve(), 3) for _ in range(3)] == [0.0, 0.1, 0.2]
+
+        with allure.step("429 with Retry-After pauses everyone and halves the rate"):
+            clock.now += 1
+            throttle.record_response(429, "2")
+            assert throttle.rate == 5
+            assert throttle.reserve() == pytest.approx(2.0)
+
+        with allure.step("Successes bring the rate back up"):
+            for _ in range(20):
+                throttle.record_response(200)
+            assert throttle.rate == 10
+
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert retry_after_seconds("soon") is None
+
+    @allure.title("Circuit breaker fails fast while the service is down")
+    @allure.description(
+        "Consecutive 5xx open the breaker; after the reset time a single probe decides whether it closes."
+    )
+    def test_circuit_breaker(self):
+        clock = FakeClock()
+        throttle = Throttle("http://service", breaker_threshold=3, breaker_reset=30, clock=clock)
+        with allure.step("Three 503s open the breaker"):
+            for _ in range(3):
+                throttle.reserve()
+                throttle.record_response(503)
+            with pytest.raises(ServiceUnavailableError, match=r"3 failed requests in a row \(last: HTTP 503\)"):
+                throttle.reserve()
+
+        with allure.step("After the reset time one probe goes through, the rest still fail fast"):
+            clock.now += 30
+            assert throttle.reserve() == 0.0
+            with pytest.raises(ServiceUnavailableError):
+                throttle.reserve()
+
+        with allure.step("A failed probe reopens, a successful one closes the breaker"):
+            throttle.record_response(502)
+            assert throttle.is_open
+            clock.now += 30
+            throttle.reserve()
+            throttle.record_response(200)
+            assert not throttle.is_open
+            assert throttle.reserve() == 0.0
+
+    @allure.title("Client stops calling an unreachable service")
+    @allure.description(
+        "Once the breaker opens, requests raise ServiceUnavailableError without touching the network."
+    )
+    def test_client_fails_fast(self):
+        import requests
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            port = closed.getsockname()[1]
+        # A plain session: no transport retries and no cassette, the refusal must really happen
+        client = StellarBurgersAPI(base_url=f"http://127.0.0.1:{port}", transport=requests.Session())
+        client.throttle = Throttle(client.urls.base_url, breaker_threshold=2, breaker_reset=60)
+
+        with allure.step("Two refused connections open the breaker"):
+            for _ in range(2):
+                with pytest.raises(requests.ConnectionError):
+                    client.get_ingredients()
+
+        with allure.step("The next request fails fast"):
+            with pytest.raises(ServiceUnavailableError, match="looks down"):
+                client.get_ingredients()
+
+    @allure.title("Retried responses pass the throttle")
+    @allure.description(
+        "Each retry of a 503 is counted by the breaker; requests that are not idempotent are not retried."
+    )
+    def test_retries_are_throttled(self, monkeypatch):
+        client = StellarBurgersAPI(base_url="http://service", transport=StatusSession(503, 503, 200))
+        monkeypatch.setattr(client.settings, "retries", 3)
+        monkeypatch.setattr(client.settings, "backoff_factor", 0)
+        monkeypatch.setattr(client.settings, "validate_responses", "off")  # the fake bodies are empty
+
+        with allure.step("A GET is retried until it succeeds"):
+            client.throttle = Throttle(client.urls.base_url, breaker_threshold=3)
+            assert client.get_ingredients().status_code == 200
+            assert client.session.calls == 3
+
+        with allure.step("Two 503s in a row open a breaker with threshold 2 before the third attempt"):
+            client.session = StatusSession(503, 503, 200)
+            client.throttle = Throttle(client.urls.base_url, breaker_threshold=2, breaker_reset=60)
+            with pytest.raises(ServiceUnavailableError):
+                client.get_ingredients()
+            assert client.session.calls == 2
+
+        with allure.step("A POST gets its 503 back"):
+            client.session = StatusSession(503, 200)
+            client.throttle = Throttle(client.urls.base_url)
+            assert client.create_order([], with_auth=False).status_code == 503
+            assert client.session.calls == 1
+
+        with allure.step("The login of a user cleanup is retried, once per attempt"):
+            client.session = StatusSession(503, 503, 401)
+            [failure] = client.delete_users([{"email": "gone@yopmail.com", "password": "P@ssw0rd!"}])
+            assert failure.login_status == 401
+            assert client.session.calls == 3
@@ -0,0 +1,94 @@
+import allure
+
+
+@allure.epic("Stellar Burgers API")
+@allure.feature("Token Refresh")
+class TestTokenRefresh:
+
+    @allure.title("Refresh token exchange (positive)")
+    @allure.description(
+        "A refresh token from registration can be exchanged for new access and refresh tokens."
+    )
+    def test_refresh_token(self, api_client):
+        with allure.step("Register user and exchange the refresh token"):
+            reg_resp = api_client.register_user()
+            assert reg_resp.status_code == 200
+            response = api_client.refresh_token(reg_resp.json()["refreshToken"])
+            assert response.status_code == 200, "Expected 200 OK for token refresh"
+            body = response.json()
+            assert body.get("success") is True
+            assert body["accessToken"].startswith("Bearer ")
+            assert body["refreshToken"] != reg_resp.json()["refreshToken"]
+
+    @allure.title("Access token is renewed before it expires")
+    @allure.description(
+        "When the access token is about to expire, the client renews it with the refresh token instead of logging in."
+    )
+    def test_proactive_renewal(self, api_client):
+        with allure.step("Register user and let the access token run out"):
+            assert api_client.register_user().status_code == 200
+            tokens = api_client.tokens.get(api_client.current_user)
+            old_refresh_token = tokens.refresh_token
+            tokens.expires_at = 0
+
+        with allure.step("Call an authorised endpoint"):
+            response = api_client.get_user_info()
+            assert response.status_code == 200
+            assert api_client.tokens.get(api_client.current_user).refresh_token != old_refresh_token
+
+    @allure.title("Rejected access token is renewed and the call retried")
+    @allure.description(
+        "If the service rejects the access token, the client renews it once and retries the original call."
+    )
+    def test_renewal_on_rejected_token(self, api_client):
+        with allure.step("Register user and corrupt the access token"):
+            assert api_client.register_user().status_code == 200
+            tokens = api_client.tokens.get(api_client.current_user)
+            tokens.access_token = "Bearer e30.e30.invalid"
+
+        with allure.step("Call an authorised endpoint"):
+            response = api_client.get_user_info()
+            assert response.status_code == 200, "Call should succeed after renewing the token"
+            assert api_client.auth_token != "Bearer e30.e30.invalid"
+
+    @allure.title("Several users active on one client")
+    @allure.description(
+        "Registering a second user does not overwrite the first one's tokens; as_user switches identity."
+    )
+    def test_several_users(self, api_client):
+        with allure.step("Register two users on the same client"):
+            assert api_client.register_user().status_code == 200
+            assert api_client.register_user().status_code == 200
+            first, second = (user.email for user in api_client.created_users)
+
+        with allure.step("Act as each user"):
+            for email in (first, second):
+                response = api_client.as_user(email).get_user_info()
+                assert response.status_code == 200
+                assert response.json()["user"]["email"] == email
+
+    @allure.title("Rejected streamed response is released before the retry")
+    @allure.description(
+        "When a streamed call is retried with a renewed token, the rejected response gives its connection back."
+    )
+    def test_rejected_stream_is_closed(self, api_client, monkeypatch):
+        with allure.step("Register user, corrupt the access token and watch the responses"):
+            assert api_client.register_user().status_code == 200
+            api_client.tokens.get(api_client.current_user).access_token = "Bearer e30.e30.invalid"
+            responses, closed = [], []
+            send = api_client.session.request
+
+            def request(method, url, **kwargs):
+                response = send(method, url, **kwargs)
+                close = response.close
+                response.close = lambda: (closed.append(response), close())
+                responses.append(response)
+                return response
+
+            monkeypatch.setattr(api_client.session, "request", request)
+
+        with allure.step("Stream the orders"):
+            with api_client.iter_user_orders() as feed:
+                assert list(feed) == []
+            rejected = next(response for response in responses if response.status_code in (401, 403))
+            assert rejected in closed
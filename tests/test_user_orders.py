@@ -25,6 +25,32 @@ class TestUserOrders:
                     data["orders"][0].get("number"), int
                 ), "Order entry missing 'number' field"
 
+    @allure.title("Retrieve a longer order history (positive)")
+    @allure.description(
+        "Users with many orders get exactly their own orders back, newest included."
+    )
+    def test_get_user_orders_history(self, data_factory, order_history):
+        for user in order_history:
+            with allure.step(f"Fetch orders of {user.email} and compare with the placed ones"):
+                response = data_factory.as_user(user).get_user_orders()
+                assert response.status_code == 200, "Expected 200 OK for fetching user orders"
+                numbers = [order["number"] for order in response.json()["orders"]]
+                # The service returns at most the latest 50 orders
+                assert sorted(numbers) == sorted(user.order_numbers[-50:]), "Order history mismatch"
+
+    @allure.title("Stream a user's order history (positive)")
+    @allure.description(
+        "The order history is parsed incrementally into Order records, even from tiny chunks."
+    )
+    def test_stream_user_orders(self, data_factory, order_history):
+        for user in order_history:
+            with allure.step(f"Stream orders of {user.email} in 16-byte chunks"):
+                with data_factory.as_user(user).iter_user_orders() as feed:
+                    feed.chunk_size = 16
+                    numbers = [order.number for order in feed]
+                assert sorted(numbers) == sorted(user.order_numbers[-50:]), "Order history mismatch"
+                assert feed.total >= len(numbers)
+
     @allure.title("Retrieve user orders without auth (negative)")
     @allure.description(
         "Requesting order history without a token should be unauthorized."
@@ -32,9 +58,7 @@ class TestUserOrders:
     def test_get_user_orders_without_auth(self, api_client):
         with allure.step("Fetch orders without authentication and verify error"):
             # Manually call the orders endpoint without auth
-            import requests
-            from utils.api_urls import ORDERS_URL
-            response = requests.get(ORDERS_URL)  # no headers
+            response = api_client.session.get(api_client.urls.orders)  # no headers
             assert response.status_code == 401, "Expected 401 for fetching orders without auth"
             error = response.json()
             assert (
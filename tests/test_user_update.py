@@ -9,16 +9,16 @@ class TestUserUpdate:
     @allure.description(
         "Authenticated user can update their name and email successfully."
     )
-    def test_update_user_with_auth(self, authenticated_user):
+    def test_update_user_with_auth(self, fresh_user):
         with allure.step("Update user profile and verify changes"):
             new_name = "NewName"
             # Get current user email to modify it
-            user_info_resp = authenticated_user.get_user_info()
+            user_info_resp = fresh_user.get_user_info()
             assert user_info_resp.status_code == 200, "Failed to get user info"
             current_email = user_info_resp.json()["user"]["email"]
             new_email = f"new_{current_email}"
             
-            update_resp = authenticated_user.update_user({"name": new_name, "email": new_email})
+            update_resp = fresh_user.update_user({"name": new_name, "email": new_email})
             assert update_resp.status_code == 200, "Expected 200 OK for valid profile update"
             body = update_resp.json()
             assert body.get("success") is True
@@ -36,11 +36,9 @@ class TestUserUpdate:
             assert user_info_resp.status_code == 200, "Failed to get user info"
             original_name = user_info_resp.json()["user"]["name"]
             
-            # Make unauthorized request using raw requests
-            import requests
-            from utils.api_urls import USER_URL
+            # Make unauthorized request on the bare transport (no auth header)
             new_name = "UnauthorizedName"
-            response = requests.patch(USER_URL, json={"name": new_name})
+            response = authenticated_user.session.patch(authenticated_user.urls.user, json={"name": new_name})
             assert response.status_code == 401, "Expected 401 for update without auth"
             error = response.json()
             assert (
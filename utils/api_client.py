@@ -1,107 +1,344 @@
-import requests
-from utils.api_urls import (
-    REGISTER_URL, LOGIN_URL, LOGOUT_URL, USER_URL,
-    ORDERS_URL, INGREDIENTS_URL, PASSWORD_RESET_URL
-)
-from utils.user_data import generate_unique_user
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.api_urls import ApiUrls
+from utils.cleanup_report import CleanupFailure, report_failures
+from utils.ingredients import shared_cache
+from utils.metrics import RequestRecord, endpoint_of, map_in_context, request_metrics
+from utils.orders import OrderFeed
+from utils.schemas import check_response
+from utils.settings import get_settings
+from utils.throttle import shared_throttle
+from utils.tokens import TokenManager, token_rejected
+from utils.user_data import TrackedUser, generate_unique_user
+
+
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
 
 
 class StellarBurgersAPI:
     """API client for Stellar Burgers application"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.auth_token = None
-        self.created_users = []  # Track users for cleanup
+    def __init__(self, base_url=None, transport=None, tokens=None):
+        """Create a client for base_url using a requests.Session-like transport.
+
+        Both default to the process-wide settings (see utils/settings.py).
+        tokens is a TokenManager to share identities with other clients.
+        requests is imported with the first client, so that collecting tests does not pay for it.
+        """
+        self.settings = get_settings()
+        self.urls = ApiUrls(base_url or self.settings.base_url)
+        if transport is None:
+            from utils.transport import build_session
+            transport = build_session(self.settings)
+        self.session = transport
+        self.tokens = tokens if tokens is not None else TokenManager()
+        self.current_user = None  # identity (email) in self.tokens the client acts as
+        self._auth_token = None  # token set directly, outside the token manager
+        self.created_users = []  # TrackedUsers to delete in cleanup_users()
+        self._tracking_lock = threading.Lock()
+        self.hooks = [request_metrics]  # called with a RequestRecord after every request
+        self.throttle = shared_throttle(self.urls.base_url, self.settings)
+    
+    @property
+    def auth_token(self):
+        """Access token of the current user"""
+        if self.current_user is not None:
+            tokens = self.tokens.get(self.current_user)
+            return tokens.access_token if tokens else None
+        return self._auth_token
+    
+    @auth_token.setter
+    def auth_token(self, token):
+        self.current_user = None
+        self._auth_token = token
+    
+    def as_user(self, identity):
+        """Return a client acting as another user in self.tokens, sharing connections and tokens"""
+        client = StellarBurgersAPI(base_url=self.urls.base_url, transport=self.session, tokens=self.tokens)
+        client.hooks = list(self.hooks)
+        client.current_user = identity
+        return client
+    
+    def request(self, method, url, retry=None, **kwargs):
+        """Send a request through the throttle and the transport, and report it to the hooks.
+
+        502/503/504 responses are retried up to settings.retries times with
+        backoff, for idempotent methods or when retry is true. Every attempt
+        passes the throttle, so retries keep to the rate limit and count
+        towards the breaker. Raises ServiceUnavailableError without sending
+        while the service is considered down.
+        """
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts = self.settings.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            response = self._send(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                break
+            response.close()
+            time.sleep(self.settings.backoff_factor * 2 ** attempt)
+        # A streamed body is read later by the caller and not validated
+        if self.settings.validate_responses != "off" and not kwargs.get("stream"):
+            check_response(method, endpoint_of(url), response, self.settings.validate_responses)
+        return response
+    
+    def _send(self, method, url, **kwargs):
+        """One attempt: wait for the throttle, send, and report the outcome to the throttle and the hooks"""
+        self.throttle.wait()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            import requests
+            self.throttle.record_error(e, down=isinstance(e, (requests.ConnectionError, requests.Timeout)))
+            self._notify(method, url, None, 0, time.perf_counter() - started)
+            raise
+        self.throttle.record_response(response.status_code, response.headers.get("Retry-After"))
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length", 0))  # announced size, the body is not read yet
+        else:
+            size = len(response.content)
+        self._notify(method, url, response.status_code, size, time.perf_counter() - started)
+        return response
+    
+    def _notify(self, method, url, status, size, elapsed):
+        if self.hooks:
+            record = RequestRecord(method, endpoint_of(url), status, size, elapsed)
+            for hook in self.hooks:
+                hook(record)
     
     def register_user(self, user_data=None):
         """Register a new user and return response"""
         if user_data is None:
             user_data = generate_unique_user()
         
-        response = self.session.post(REGISTER_URL, json=user_data)
+        response = self.request("POST", self.urls.register, json=user_data)
         if response.status_code == 200:
-            self.created_users.append(user_data)
-            self.auth_token = response.json().get("accessToken")
+            self.track_user(user_data)
+            self._store_tokens(user_data["email"], response)
         return response
     
+    def track_user(self, user):
+        """Delete a user (payload dict or TrackedUser) in the next cleanup"""
+        user = TrackedUser.of(user)
+        with self._tracking_lock:
+            self.created_users.append(user)
+        return user
+    
+    def take_tracked_users(self, max_age=None, limit=None):
+        """Stop tracking and return users, oldest first.
+
+        With max_age, only users tracked for at least max_age seconds, except
+        the one the client acts as; with limit, at most that many.
+        """
+        cutoff = None if max_age is None else time.monotonic() - max_age
+        with self._tracking_lock:
+            users = [TrackedUser.of(user) for user in self.created_users]
+            taken, kept = [], []
+            for user in users:
+                due = cutoff is None or (user.registered_at <= cutoff and user.email != self.current_user)
+                (taken if due and (limit is None or len(taken) < limit) else kept).append(user)
+            self.created_users = kept
+        return taken
+    
     def login_user(self, email, password):
         """Login user and return response"""
         user_data = {"email": email, "password": password}
-        response = self.session.post(LOGIN_URL, json=user_data)
+        response = self.request("POST", self.urls.login, json=user_data)
         if response.status_code == 200:
-            self.auth_token = response.json().get("accessToken")
+            self._store_tokens(email, response)
         return response
     
+    def _store_tokens(self, identity, response):
+        body = response.json()
+        self.tokens.store(identity, body.get("accessToken"), body.get("refreshToken"))
+        self.current_user = identity
+    
+    def refresh_token(self, refresh_token):
+        """Exchange a refresh token for new access and refresh tokens"""
+        return self.request("POST", self.urls.token, json={"token": refresh_token})
+    
     def logout_user(self, refresh_token):
         """Logout user"""
-        return self.session.post(LOGOUT_URL, json={"token": refresh_token})
+        return self.request("POST", self.urls.logout, json={"token": refresh_token})
     
     def get_user_info(self):
         """Get current user information"""
-        headers = self._get_auth_headers()
-        return self.session.get(USER_URL, headers=headers)
+        return self._authed_request("GET", self.urls.user)
     
     def update_user(self, user_data):
-        """Update user information"""
-        headers = self._get_auth_headers()
-        return self.session.patch(USER_URL, headers=headers, json=user_data)
+        """Update user information; tokens and cleanup tracking follow a new email or password"""
+        response = self._authed_request("PATCH", self.urls.user, json=user_data)
+        identity = self.current_user
+        if response.status_code == 200 and identity is not None:
+            email = user_data.get("email", identity)
+            with self._tracking_lock:
+                for user in self.created_users:
+                    if user.email == identity:
+                        user.email = email
+                        user.password = user_data.get("password", user.password)
+            if email != identity:
+                self.tokens.rename(identity, email)
+                self.current_user = email
+        return response
     
     def get_ingredients(self):
         """Get available ingredients"""
-        return self.session.get(INGREDIENTS_URL)
+        return self.request("GET", self.urls.ingredients)
+    
+    def get_ingredient_catalogue(self, refresh=False):
+        """Get the ingredient catalogue, fetched at most once per TTL for the process"""
+        cache = shared_cache(
+            self.urls.base_url,
+            self._fetch_ingredients,
+            ttl=self.settings.ingredients_ttl,
+            snapshot_path=self.settings.ingredients_snapshot,
+        )
+        return cache.get(refresh, fetch=self._fetch_ingredients)
+    
+    def _fetch_ingredients(self):
+        """Fetch the raw ingredient list for the catalogue cache"""
+        response = self.get_ingredients()
+        response.raise_for_status()
+        body = response.json()
+        if not body.get("success"):
+            raise ValueError("Ingredients API returned success=false")
+        return body["data"]
     
     def create_order(self, ingredients, with_auth=True):
         """Create an order with given ingredients"""
-        headers = self._get_auth_headers() if with_auth else None
         order_data = {"ingredients": ingredients}
-        return self.session.post(ORDERS_URL, headers=headers, json=order_data)
+        if with_auth:
+            return self._authed_request("POST", self.urls.orders, json=order_data)
+        return self.request("POST", self.urls.orders, json=order_data)
     
     def get_user_orders(self):
         """Get orders for authenticated user"""
-        headers = self._get_auth_headers()
-        return self.session.get(ORDERS_URL, headers=headers)
+        return self._authed_request("GET", self.urls.orders)
+    
+    def get_all_orders(self):
+        """Get the latest orders of all users"""
+        return self.request("GET", self.urls.orders_all)
+    
+    def iter_user_orders(self, limit=None):
+        """Stream the authenticated user's orders as Order records, at most limit of them"""
+        return self._order_feed(self._authed_request("GET", self.urls.orders, stream=True), limit)
+    
+    def iter_all_orders(self, limit=None):
+        """Stream the latest orders of all users as Order records, at most limit of them"""
+        return self._order_feed(self.request("GET", self.urls.orders_all, stream=True), limit)
+    
+    def _order_feed(self, response, limit):
+        if not response.ok:
+            response.close()
+            response.raise_for_status()
+        return OrderFeed(response, limit)
     
     def request_password_reset(self, email):
         """Request password reset"""
-        return self.session.post(PASSWORD_RESET_URL, json={"email": email})
+        return self.request("POST", self.urls.password_reset, json={"email": email})
     
     def _get_auth_headers(self):
-        """Get authorization headers"""
-        if not self.auth_token:
+        """Get authorization headers, renewing the current user's token when it is about to expire"""
+        if self.current_user is not None and self.tokens.get(self.current_user):
+            token = self.tokens.access_token(self.current_user, self)
+        else:
+            token = self._auth_token
+        if not token:
             raise ValueError("No auth token available. Please login first.")
-        return {"Authorization": self.auth_token}
+        return {"Authorization": token}
+    
+    def _authed_request(self, method, url, **kwargs):
+        """Send an authorised request; if the token is rejected, renew it once and retry"""
+        headers = self._get_auth_headers()
+        response = self.request(method, url, headers=headers, **kwargs)
+        if self.current_user is not None and token_rejected(response):
+            if self.tokens.refresh(self.current_user, self, stale_token=headers["Authorization"]):
+                response.close()  # a streamed response would keep its pooled connection otherwise
+                response = self.request(method, url, headers=self._get_auth_headers(), **kwargs)
+        return response
     
     def delete_user(self):
         """Delete current authenticated user"""
-        headers = self._get_auth_headers()
-        return self.session.delete(USER_URL, headers=headers)
+        response = self._authed_request("DELETE", self.urls.user)
+        if response.status_code in [200, 202] and self.current_user is not None:
+            # Gone already: cleanup_users() would fail to log in as the user
+            with self._tracking_lock:
+                self.created_users = [user for user in self.created_users if user.email != self.current_user]
+            self.tokens.discard(self.current_user)
+        return response
+    
+    def _delete_tracked_user(self, user):
+        """Delete one TrackedUser, with its token from self.tokens if it has one. Return a CleanupFailure or None.
+
+        Runs on the cleanup pool, so renewing a stale token does not hold up the other deletes.
+        request() retries 502/503/504, the login included; the transport retries connection errors.
+        """
+        email = user.email
+        token = self.cleanup_token(email)
+        self.tokens.discard(email)
+        try:
+            if token:
+                delete_resp = self.request("DELETE", self.urls.user, headers={"Authorization": token})
+                if delete_resp.status_code in [200, 202, 204, 404]:
+                    return None
+                if not token_rejected(delete_resp):
+                    return CleanupFailure(user, f"Failed to delete user {email}: {delete_resp.status_code}")
+            # Login as the user first
+            login_data = {"email": email, "password": user.password}
+            login_resp = self.request("POST", self.urls.login, retry=True, json=login_data)
+            if login_resp.status_code != 200:
+                return CleanupFailure(user, f"Failed to login user {email} for cleanup", login_resp.status_code)
+            headers = {"Authorization": login_resp.json().get("accessToken")}
+            delete_resp = self.request("DELETE", self.urls.user, headers=headers)
+            if delete_resp.status_code not in [200, 202, 204, 404]:
+                return CleanupFailure(user, f"Failed to delete user {email}: {delete_resp.status_code}")
+        except Exception as e:
+            return CleanupFailure(user, f"Exception during cleanup for {email}: {str(e)}")
+        return None
+    
+    def cleanup_token(self, identity):
+        """Current access token of a registered user, or None if there is none"""
+        if self.tokens.get(identity) is None:
+            return None
+        try:
+            return self.tokens.access_token(identity, self)
+        except Exception:
+            return None  # delete_users() falls back to a login
+    
+    def delete_users(self, users):
+        """Delete users (TrackedUsers or payload dicts) concurrently on a bounded thread pool; return the CleanupFailures.
+
+        Tokens of the users in self.tokens are used (renewed if needed) and then forgotten.
+        """
+        users = [TrackedUser.of(user) for user in users]
+        if len(users) <= 1:
+            results = [self._delete_tracked_user(user) for user in users]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.settings.cleanup_workers, len(users))) as executor:
+                results = list(map_in_context(executor, self._delete_tracked_user, users))
+        return [failure for failure in results if failure is not None]
     
     def cleanup_users(self):
-        """Clean up created users by attempting to delete them"""
-        cleanup_errors = []
-        
-        # Try to delete each created user
-        for user_data in self.created_users:
-            try:
-                # Login as the user first
-                login_resp = self.login_user(user_data["email"], user_data["password"])
-                if login_resp.status_code == 200:
-                    # Try to delete the user
-                    delete_resp = self.delete_user()
-                    if delete_resp.status_code not in [200, 204, 404]:
-                        cleanup_errors.append(f"Failed to delete user {user_data['email']}: {delete_resp.status_code}")
-                else:
-                    cleanup_errors.append(f"Failed to login user {user_data['email']} for cleanup")
-            except Exception as e:
-                cleanup_errors.append(f"Exception during cleanup for {user_data['email']}: {str(e)}")
-        
-        # Clear tracking regardless of success/failure
-        self.created_users.clear()
+        """Clean up created users by deleting them concurrently.
+
+        Tokens returned at registration are reused, so most users need no login.
+        Users that cannot be deleted are reported and written to the leak ledger
+        for the next run's sweep. Safe to call concurrently.
+        """
+        cleanup_errors = self.delete_tracked(self.take_tracked_users())
         self.auth_token = None
-        
-        # Log cleanup errors if any (in a real scenario, you might want to log these)
-        if cleanup_errors:
-            print(f"Cleanup warnings: {cleanup_errors}")
-        
-        return cleanup_errors
\ No newline at end of file
+        return cleanup_errors
+    
+    def delete_tracked(self, users):
+        """Delete TrackedUsers whose tokens are in self.tokens (taken from this client or a user pool).
+
+        Reports failures and returns their messages.
+        """
+        failures = self.delete_users(users)
+        if failures:
+            report_failures(self.urls.base_url, failures, self.settings.leak_ledger)
+        return [failure.message for failure in failures]
@@ -1,16 +1,32 @@
-BASE_URL = "https://stellarburgers.nomoreparties.site"
-
 # Auth
-REGISTER_URL = f"{BASE_URL}/api/auth/register"
-LOGIN_URL = f"{BASE_URL}/api/auth/login"
-LOGOUT_URL = f"{BASE_URL}/api/auth/logout"
-USER_URL = f"{BASE_URL}/api/auth/user"
+REGISTER_PATH = "/api/auth/register"
+LOGIN_PATH = "/api/auth/login"
+LOGOUT_PATH = "/api/auth/logout"
+USER_PATH = "/api/auth/user"
+TOKEN_PATH = "/api/auth/token"
 
 # Orders
-ORDERS_URL = f"{BASE_URL}/api/orders"
-ORDERS_ALL_URL = f"{BASE_URL}/api/orders/all"
-INGREDIENTS_URL = f"{BASE_URL}/api/ingredients"
+ORDERS_PATH = "/api/orders"
+ORDERS_ALL_PATH = "/api/orders/all"
+INGREDIENTS_PATH = "/api/ingredients"
 
 # Password Reset
-PASSWORD_RESET_URL = f"{BASE_URL}/api/password-reset"
-PASSWORD_RESET_CONFIRM_URL = f"{BASE_URL}/api/password-reset/reset"
+PASSWORD_RESET_PATH = "/api/password-reset"
+PASSWORD_RESET_CONFIRM_PATH = "/api/password-reset/reset"
+
+
+class ApiUrls:
+    """Absolute endpoint URLs for one base URL"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.register = self.base_url + REGISTER_PATH
+        self.login = self.base_url + LOGIN_PATH
+        self.logout = self.base_url + LOGOUT_PATH
+        self.user = self.base_url + USER_PATH
+        self.token = self.base_url + TOKEN_PATH
+        self.orders = self.base_url + ORDERS_PATH
+        self.orders_all = self.base_url + ORDERS_ALL_PATH
+        self.ingredients = self.base_url + INGREDIENTS_PATH
+        self.password_reset = self.base_url + PASSWORD_RESET_PATH
+        self.password_reset_confirm = self.base_url + PASSWORD_RESET_CONFIRM_PATH
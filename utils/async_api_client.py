@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import httpx
+
+from utils.api_client import IDEMPOTENT_METHODS, RETRY_STATUSES
+from utils.api_urls import ApiUrls
+from utils.cleanup_report import CleanupFailure, report_failures
+from utils.metrics import RequestRecord, endpoint_of, request_metrics
+from utils.schemas import check_response
+from utils.settings import get_settings
+from utils.throttle import shared_throttle
+from utils.tokens import token_rejected
+from utils.user_data import TrackedUser, generate_unique_user
+
+
+class AsyncStellarBurgersAPI:
+    """Asyncio counterpart of StellarBurgersAPI with the same method surface.
+
+    Requests go through one bounded httpx connection pool and a semaphore
+    that caps the number in flight. fork() creates more identities that share
+    both, so one event loop can drive hundreds of users at once. Throttling,
+    retries and response validation work as in StellarBurgersAPI; access
+    tokens are not renewed (there is no TokenManager).
+    """
+
+    def __init__(self, base_url=None, concurrency=None, http_client=None, semaphore=None):
+        self.settings = get_settings()
+        self.urls = ApiUrls(base_url or self.settings.base_url)
+        concurrency = concurrency or self.settings.concurrency
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                timeout=self.settings.timeout,
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+                transport=httpx.AsyncHTTPTransport(retries=self.settings.retries),
+            )
+        self.http_client = http_client
+        self.semaphore = semaphore or asyncio.Semaphore(concurrency)
+        self.auth_token = None
+        self.current_user = None  # email of the user registered or logged in last
+        self.created_users = []  # TrackedUsers to delete in cleanup_users()
+        self._registration_tokens = {}  # email -> access token, reused by cleanup_users
+        self.hooks = [request_metrics]  # called with a RequestRecord after every request
+        self.throttle = shared_throttle(self.urls.base_url, self.settings)
+        self._forks = []
+
+    def fork(self):
+        """Return a client for another identity sharing this pool and semaphore.
+
+        Users registered by forks are cleaned up with this client's cleanup_users().
+        """
+        client = AsyncStellarBurgersAPI(
+            base_url=self.urls.base_url, http_client=self.http_client, semaphore=self.semaphore
+        )
+        client.hooks = list(self.hooks)
+        self._forks.append(client)
+        return client
+
+    async def _request(self, method, url, retry=None, **kwargs):
+        """Send a request like StellarBurgersAPI.request(): throttled, retried on 502/503/504, validated"""
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        attempts = self.settings.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            response = await self._send(method, url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                break
+            await asyncio.sleep(self.settings.backoff_factor * 2 ** attempt)
+        if self.settings.validate_responses != "off":
+            check_response(method, endpoint_of(url), response, self.settings.validate_responses)
+        return response
+
+    async def _send(self, method, url, **kwargs):
+        """One attempt: wait for the throttle and the semaphore, send, and report the outcome"""
+        delay = self.throttle.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        async with self.semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self.http_client.request(method, url, **kwargs)
+            except Exception as e:
+                self.throttle.record_error(e, down=isinstance(e, httpx.TransportError))
+                self._notify(method, url, None, 0, time.perf_counter() - started)
+                raise
+        self.throttle.record_response(response.status_code, response.headers.get("Retry-After"))
+        self._notify(method, url, response.status_code, len(response.content), time.perf_counter() - started)
+        return response
+
+    def _notify(self, method, url, status, size, elapsed):
+        if self.hooks:
+            record = RequestRecord(method, endpoint_of(url), status, size, elapsed)
+            for hook in self.hooks:
+                hook(record)
+
+    async def register_user(self, user_data=None):
+        """Register a new user and return response"""
+        if user_data is None:
+            user_data = generate_unique_user()
+
+        response = await self._request("POST", self.urls.register, json=user_data)
+        if response.status_code == 200:
+            self.created_users.append(TrackedUser.of(user_data))
+            self.auth_token = response.json().get("accessToken")
+            self.current_user = user_data["email"]
+            self._registration_tokens[user_data["email"]] = self.auth_token
+        return response
+
+    async def login_user(self, email, password):
+        """Login user and return response"""
+        user_data = {"email": email, "password": password}
+        response = await self._request("POST", self.urls.login, json=user_data)
+        if response.status_code == 200:
+            self.auth_token = response.json().get("accessToken")
+            self.current_user = email
+        return response
+
+    async def logout_user(self, refresh_token):
+        """Logout user"""
+        return await self._request("POST", self.urls.logout, json={"token": refresh_token})
+
+    async def get_user_info(self):
+        """Get current user information"""
+        return await self._request("GET", self.urls.user, headers=self._get_auth_headers())
+
+    async def update_user(self, user_data):
+        """Update user information"""
+        return await self._request("PATCH", self.urls.user, headers=self._get_auth_headers(), json=user_data)
+
+    async def get_ingredients(self):
+        """Get available ingredients"""
+        return await self._request("GET", self.urls.ingredients)
+
+    async def create_order(self, ingredients, with_auth=True):
+        """Create an order with given ingredients"""
+        headers = self._get_auth_headers() if with_auth else None
+        return await self._request("POST", self.urls.orders, headers=headers, json={"ingredients": ingredients})
+
+    async def get_user_orders(self):
+        """Get orders for authenticated user"""
+        return await self._request("GET", self.urls.orders, headers=self._get_auth_headers())
+
+    async def get_all_orders(self):
+        """Get the latest orders of all users"""
+        return await self._request("GET", self.urls.orders_all)
+
+    async def request_password_reset(self, email):
+        """Request password reset"""
+        return await self._request("POST", self.urls.password_reset, json={"email": email})
+
+    def _get_auth_headers(self):
+        """Get authorization headers"""
+        if not self.auth_token:
+            raise ValueError("No auth token available. Please login first.")
+        return {"Authorization": self.auth_token}
+
+    async def delete_user(self):
+        """Delete current authenticated user"""
+        response = await self._request("DELETE", self.urls.user, headers=self._get_auth_headers())
+        if response.status_code in [200, 202] and self.current_user is not None:
+            # Gone already: cleanup_users() would fail to log in as the user
+            self.created_users = [user for user in self.created_users if user.email != self.current_user]
+            self._registration_tokens.pop(self.current_user, None)
+            self.auth_token = self.current_user = None
+        return response
+
+    async def _cleanup_user(self, user, token=None):
+        """Delete one TrackedUser, with its registration token if still valid"""
+        try:
+            if token:
+                delete_resp = await self._request("DELETE", self.urls.user, headers={"Authorization": token})
+                if delete_resp.status_code in [200, 202, 204, 404]:
+                    return None
+                if not token_rejected(delete_resp):
+                    return CleanupFailure(user, f"Failed to delete user {user.email}: {delete_resp.status_code}")
+            login_data = {"email": user.email, "password": user.password}
+            login_resp = await self._request("POST", self.urls.login, retry=True, json=login_data)
+            if login_resp.status_code != 200:
+                return CleanupFailure(user, f"Failed to login user {user.email} for cleanup",
+                                      login_resp.status_code)
+            headers = {"Authorization": login_resp.json().get("accessToken")}
+            delete_resp = await self._request("DELETE", self.urls.user, headers=headers)
+            if delete_resp.status_code not in [200, 202, 204, 404]:
+                return CleanupFailure(user, f"Failed to delete user {user.email}: {delete_resp.status_code}")
+        except Exception as e:
+            return CleanupFailure(user, f"Exception during cleanup for {user.email}: {str(e)}")
+        return None
+
+    async def cleanup_users(self):
+        """Clean up users created by this client and its forks concurrently"""
+        users, self.created_users = self.created_users, []
+        tokens, self._registration_tokens = self._registration_tokens, {}
+        for client in self._forks:
+            users.extend(client.created_users)
+            tokens.update(client._registration_tokens)
+            client.created_users, client._registration_tokens = [], {}
+        users = [TrackedUser.of(user) for user in users]
+        results = await asyncio.gather(*(self._cleanup_user(user, tokens.get(user.email)) for user in users))
+        failures = [failure for failure in results if failure is not None]
+        self.auth_token = None
+        if failures:
+            report_failures(self.urls.base_url, failures, self.settings.leak_ledger)
+        return [failure.message for failure in failures]
+
+    async def aclose(self):
+        """Close the connection pool if this client created it"""
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,60 @@
+"""Incremental deletion of a long-lived client's test users.
+
+In a soak run one client may register users for hours; instead of deleting
+them all at the end, BackgroundCleanup deletes the ones tracked for longer
+than max_age in batches while the run goes on, so neither the tracked list
+nor the service's user table grows with the run length.
+"""
+import threading
+
+
+class BackgroundCleanup:
+    """Thread deleting a client's stale tracked users every interval seconds.
+
+    Users are stale after max_age seconds; the user the client currently acts
+    as is kept. Failures are reported like cleanup_users() failures.
+    """
+
+    def __init__(self, client, max_age=300.0, interval=10.0, batch_size=50):
+        self.client = client
+        self.max_age = max_age
+        self.interval = interval
+        self.batch_size = batch_size
+        self.deleted = 0
+        self.failed = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """Delete one batch of stale users; return the number taken"""
+        users = self.client.take_tracked_users(max_age=self.max_age, limit=self.batch_size)
+        if users:
+            failed = len(self.client.delete_tracked(users))
+            self.failed += failed
+            self.deleted += len(users) - failed
+        return len(users)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Drain the backlog before sleeping again
+            while self.run_once() == self.batch_size and not self._stop.is_set():
+                pass
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="background-cleanup", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop after the batch in progress; users still tracked are left to cleanup_users()"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
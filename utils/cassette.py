@@ -0,0 +1,135 @@
+"""Record/replay of HTTP interactions ("cassettes").
+
+In record mode every request made through a CassetteSession (see
+utils/transport.py) is sent and saved
+to the active cassette file; in replay mode responses are served from that
+file without touching the network. Generated users are seeded per cassette,
+so replays send exactly the requests that were recorded.
+
+Requests are matched on method, path and JSON body, in recorded order; the
+host and headers (e.g. tokens) are ignored. Generated emails keep the run's
+namespace, so re-recording never reuses accounts of an earlier recording: the
+namespace is left out of the request keys, and replayed responses get the
+replaying run's namespace instead of the recorded one.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from utils.user_data import EMAIL_PREFIX, seed_users, user_namespace
+
+
+MODES = ("off", "record", "replay", "auto")
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recorded interaction"""
+
+
+def _renamespace(text, old, new):
+    """text with the generated emails of namespace old moved to namespace new"""
+    return text.replace(EMAIL_PREFIX + old, EMAIL_PREFIX + new) if old != new else text
+
+
+def _request_key(method, url, body):
+    key = f"{method} {urlsplit(url).path} {json.dumps(body, sort_keys=True, ensure_ascii=False)}"
+    return _renamespace(key, user_namespace(), "")
+
+
+class Cassette:
+    """Interactions of one test, stored as compact JSON"""
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self.namespace = user_namespace()  # of the recording run, read from the file in replay
+        self.interactions = []
+        self._unplayed = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self._load()
+
+    def _load(self):
+        # A test that made no requests has no file
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as cassette:
+                data = json.load(cassette)
+            self.interactions = data["interactions"]
+            self.namespace = data.get("namespace", "")
+        for interaction in self.interactions:
+            self._unplayed.setdefault(interaction["key"], []).append(interaction)
+
+    def play(self, method, url, body):
+        key = _request_key(method, url, body)
+        with self._lock:
+            queue = self._unplayed.get(key)
+            if not queue:
+                raise CassetteMiss(f"No recorded interaction for {key} in {self.path}; "
+                                   f"re-record it with --cassettes=record")
+            interaction = queue.pop(0)
+        import requests  # only once a test runs; conftest.py imports this module for MODES
+        from requests.structures import CaseInsensitiveDict
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": interaction["content_type"]})
+        response.encoding = "utf-8"
+        response.url = url
+        content = interaction["body"]
+        content = content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)
+        response._content = _renamespace(content, self.namespace, user_namespace()).encode()
+        response._content_consumed = True  # lets iter_content() serve the body to streaming readers
+        return response
+
+    def record(self, method, url, body, response):
+        content_type = response.headers.get("Content-Type", "")
+        try:
+            content = response.json() if "json" in content_type else response.text
+        except ValueError:
+            content = response.text
+        with self._lock:
+            self.interactions.append({
+                "key": _request_key(method, url, body),
+                "status": response.status_code,
+                "content_type": content_type,
+                "body": content,
+            })
+
+    def save(self):
+        if self.mode != "record" or not self.interactions:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as cassette:
+            json.dump({"version": 1, "namespace": self.namespace, "interactions": self.interactions}, cassette,
+                      ensure_ascii=False, separators=(",", ":"))
+
+
+_active = None
+
+
+def active_cassette():
+    return _active
+
+
+@contextmanager
+def use_cassette(path, mode, seed):
+    """Activate a cassette and seed user generation while the block runs.
+
+    mode "auto" replays an existing file and records a missing one.
+    """
+    global _active
+    if mode == "auto":
+        mode = "replay" if os.path.exists(path) else "record"
+    cassette = Cassette(path, mode)
+    previous, previous_random = _active, seed_users(seed)
+    _active = cassette
+    try:
+        yield cassette
+    finally:
+        _active = previous
+        seed_users(previous_random)
+        cassette.save()
+
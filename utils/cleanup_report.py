@@ -0,0 +1,58 @@
+import threading
+
+from utils.leak_ledger import get_ledger
+
+
+class CleanupFailure:
+    """A test user (TrackedUser) that could not be deleted"""
+
+    __slots__ = ("user", "message", "login_status")
+
+    def __init__(self, user, message, login_status=None):
+        self.user = user
+        self.message = message
+        self.login_status = login_status  # set when logging in as the user failed
+
+
+class CleanupReport:
+    """Thread-safe collection of cleanup failures for the end-of-run summary.
+
+    Keeps the first limit messages and counts the rest; every leaked user is
+    in the leak ledger anyway.
+    """
+
+    def __init__(self, limit=1000):
+        self._lock = threading.Lock()
+        self.limit = limit
+        self.count = 0
+        self._errors = []
+
+    def extend(self, errors, count=None):
+        """Add error messages; count is the total they stand for when some were dropped elsewhere"""
+        errors = list(errors)
+        with self._lock:
+            self.count += len(errors) if count is None else count
+            self._errors.extend(errors[:max(self.limit - len(self._errors), 0)])
+
+    @property
+    def errors(self):
+        with self._lock:
+            return list(self._errors)
+
+    def clear(self):
+        with self._lock:
+            self.count = 0
+            self._errors.clear()
+
+
+# Shared by every client in the process; utils/pytest_plugin.py merges the reports of xdist workers
+cleanup_report = CleanupReport()
+
+
+def report_failures(base_url, failures, ledger_path):
+    """Add CleanupFailures to the end-of-run report and their users to the leak ledger (ledger_path None: no ledger)"""
+    cleanup_report.extend(failure.message for failure in failures)
+    ledger = get_ledger(ledger_path)
+    if ledger is not None:
+        for failure in failures:
+            ledger.record(base_url, failure.user, failure.message)
@@ -0,0 +1,87 @@
+"""Bulk, reproducible test data: users with order history.
+
+A plan (users and the burgers each of them orders) is derived from a seed,
+so the same seed always produces the same dataset shape and the same
+emails within a run namespace. Provisioning runs the plan concurrently.
+"""
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.api_client import StellarBurgersAPI
+from utils.metrics import map_in_context
+from utils.user_data import generate_unique_user
+
+
+def random_burger(catalogue, rng, max_fillings=4):
+    """Ingredient ids of a valid burger: one bun (top and bottom) and 1..max_fillings fillings or sauces"""
+    bun = rng.choice(catalogue.buns)["_id"]
+    fillings = catalogue.mains + catalogue.sauces
+    inside = [rng.choice(fillings)["_id"] for _ in range(rng.randint(1, max_fillings))]
+    return [bun, *inside, bun]
+
+
+class ProvisionedUser:
+    """A registered user and the orders placed for it"""
+
+    __slots__ = ("user_data", "burgers", "order_numbers")
+
+    def __init__(self, user_data, burgers):
+        self.user_data = user_data
+        self.burgers = burgers  # planned ingredient id lists, in order
+        self.order_numbers = []
+
+    @property
+    def email(self):
+        return self.user_data["email"]
+
+
+class DataFactory:
+    """Provision users with order history through a shared client"""
+
+    def __init__(self, client=None, seed=0, workers=None):
+        self.client = client or StellarBurgersAPI()
+        self.seed = seed
+        self.workers = workers or self.client.settings.pool_size  # one thread per pooled connection
+        if self.client.settings.cassettes != "off":
+            self.workers = 1  # cassettes replay same-body requests in recorded order
+        self._rng = random.Random(seed)
+
+    def plan(self, users, orders_per_user):
+        """Return ProvisionedUsers for the next users of the seeded sequence, without any request"""
+        catalogue = self.client.get_ingredient_catalogue()
+        return [
+            ProvisionedUser(
+                generate_unique_user(self._rng),
+                [random_burger(catalogue, self._rng) for _ in range(orders_per_user)],
+            )
+            for _ in range(users)
+        ]
+
+    def _provision_one(self, user):
+        client = StellarBurgersAPI(base_url=self.client.urls.base_url, transport=self.client.session,
+                                   tokens=self.client.tokens)
+        client.hooks = list(self.client.hooks)
+        response = client.register_user(user.user_data)
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to register {user.email}: {response.status_code}")
+        # Tracked on the factory client, so one cleanup_users() removes the whole dataset
+        self.client.track_user(user.user_data)
+        for burger in user.burgers:
+            response = client.create_order(burger)
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to create order for {user.email}: {response.status_code}")
+            user.order_numbers.append(response.json()["order"]["number"])
+        return user
+
+    def provision(self, users, orders_per_user):
+        """Register users and place their orders concurrently; return the ProvisionedUsers"""
+        planned = self.plan(users, orders_per_user)
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(len(planned), 1))) as executor:
+            return list(map_in_context(executor, self._provision_one, planned))
+
+    def as_user(self, user):
+        """Client acting as a provisioned user"""
+        return self.client.as_user(user.email)
+
+    def cleanup(self):
+        return self.client.cleanup_users()
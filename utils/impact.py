@@ -0,0 +1,161 @@
+"""Test impact selection: rerun only the tests whose code changed.
+
+While tests run, a profiler records the project functions (utils/, benchmarks/)
+each test executes, including those run by the fixtures it uses. Every
+function is fingerprinted by its own source, and every module by the code
+outside its functions (imports, constants, class attributes). On the next run
+a test whose last result was a pass is not run again if its test file, the
+global files (conftest.py, utils/pytest_plugin.py, pytest.ini,
+requirements.txt), the target service and every recorded fingerprint are
+unchanged.
+"""
+import ast
+import hashlib
+import os
+import sys
+import threading
+
+
+PACKAGES = ("utils", "benchmarks")  # project code whose changes are tracked
+GLOBAL_FILES = ("conftest.py", "utils/pytest_plugin.py", "pytest.ini", "requirements.txt")
+MODULE = "<module>"
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_source(source):
+    """{qualname: hash} of the functions of a module, plus MODULE for everything else"""
+    lines = source.splitlines()
+    skeleton = list(lines)
+    hashes = {}
+
+    def visit(body, prefix):
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list]) - 1
+                qualname = prefix + node.name
+                # A property getter and setter share one qualname
+                hashes[qualname] = _digest(hashes.get(qualname, "") + "\n".join(lines[start:node.end_lineno]))
+                skeleton[start:node.end_lineno] = [""] * (node.end_lineno - start)
+            elif isinstance(node, ast.ClassDef):
+                visit(node.body, f"{prefix}{node.name}.")
+
+    visit(ast.parse(source).body, "")
+    hashes[MODULE] = _digest("\n".join(skeleton))
+    return hashes
+
+
+class Fingerprints:
+    """Fingerprints of project files under rootdir, computed once per process"""
+
+    def __init__(self, rootdir):
+        self.rootdir = rootdir
+        self._modules = {}
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _read(self, relpath):
+        try:
+            with open(os.path.join(self.rootdir, relpath), encoding="utf-8") as source:
+                return source.read()
+        except OSError:
+            return None
+
+    def module(self, relpath):
+        with self._lock:
+            if relpath not in self._modules:
+                source = self._read(relpath)
+                try:
+                    self._modules[relpath] = fingerprint_source(source) if source is not None else {}
+                except SyntaxError:
+                    self._modules[relpath] = {}
+            return self._modules[relpath]
+
+    def file(self, relpath):
+        with self._lock:
+            if relpath not in self._files:
+                source = self._read(relpath)
+                self._files[relpath] = None if source is None else _digest(source)
+            return self._files[relpath]
+
+    def dependency(self, dependency):
+        """Current hash of "path::qualname", None if it no longer exists"""
+        relpath, qualname = dependency.split("::", 1)
+        return self.module(relpath).get(qualname)
+
+    def global_files(self):
+        return _digest("".join(str(self.file(relpath)) for relpath in GLOBAL_FILES))
+
+
+class DependencyTracer:
+    """Records the project functions executed, in every thread"""
+
+    def __init__(self, fingerprints):
+        self.fingerprints = fingerprints
+        self.current = set()
+        self.fixture_dependencies = {}  # fixture name -> dependencies of its setup
+        self._keys = {}  # code object -> "path::qualname" or None
+        prefixes = [os.path.join(os.path.abspath(fingerprints.rootdir), package) + os.sep for package in PACKAGES]
+        self._prefixes = tuple(prefixes)
+
+    def _key(self, code):
+        filename = code.co_filename
+        if not filename.startswith(self._prefixes) or filename == __file__:
+            return None
+        relpath = os.path.relpath(filename, self.fingerprints.rootdir).replace(os.sep, "/")
+        qualname = code.co_qualname.split(".<locals>", 1)[0]
+        if qualname not in self.fingerprints.module(relpath):
+            qualname = MODULE  # module-level lambdas, comprehensions
+        return f"{relpath}::{qualname}"
+
+    def _profile(self, frame, event, arg):
+        if event != "call":
+            return
+        code = frame.f_code
+        try:
+            key = self._keys[code]
+        except KeyError:
+            key = self._keys[code] = self._key(code)
+        if key is not None:
+            self.current.add(key)
+
+    def start(self):
+        threading.setprofile(self._profile)
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        sys.setprofile(None)
+        threading.setprofile(None)
+
+    def begin_fixture(self):
+        saved, self.current = self.current, set()
+        return saved
+
+    def end_fixture(self, name, saved):
+        dependencies = self.current
+        self.fixture_dependencies.setdefault(name, set()).update(dependencies)
+        self.current = saved | dependencies
+
+    def begin_test(self):
+        self.current = set()
+
+    def end_test(self, fixturenames):
+        """Dependencies of the test that just ran, with their current hashes"""
+        dependencies = set(self.current)
+        for name in fixturenames:
+            dependencies |= self.fixture_dependencies.get(name, set())
+        dependencies |= {dependency.split("::", 1)[0] + "::" + MODULE for dependency in dependencies}
+        return {dependency: self.fingerprints.dependency(dependency) for dependency in sorted(dependencies)}
+
+
+def unchanged(entry, fingerprints, test_file, target):
+    """True if a cached result entry still applies"""
+    return (
+        entry.get("outcome") == "passed"
+        and entry.get("target") == target
+        and entry.get("file") == fingerprints.file(test_file)
+        and entry.get("globals") == fingerprints.global_files()
+        and all(fingerprints.dependency(dependency) == digest for dependency, digest in entry["dependencies"].items())
+    )
@@ -0,0 +1,135 @@
+"""Ingredient catalogue cache.
+
+The ingredient list is static reference data, so it is fetched once, kept in
+memory for a TTL and optionally persisted to a JSON snapshot that later runs
+start from.
+"""
+import json
+import os
+import threading
+import time
+
+
+INGREDIENT_TYPES = ("bun", "main", "sauce")
+
+
+class IngredientCatalogue:
+    """Ingredients indexed by _id and by type (bun/main/sauce)"""
+
+    def __init__(self, items, fetched_at=None):
+        self.items = list(items)
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self._by_id = {item["_id"]: item for item in self.items}
+        self._by_type = {kind: [] for kind in INGREDIENT_TYPES}
+        for item in self.items:
+            self._by_type.setdefault(item["type"], []).append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, ingredient_id):
+        return ingredient_id in self._by_id
+
+    def by_id(self, ingredient_id):
+        """Return the ingredient with this _id or raise KeyError"""
+        return self._by_id[ingredient_id]
+
+    def by_type(self, kind):
+        """Return the ingredients of a type: 'bun', 'main' or 'sauce'"""
+        return list(self._by_type.get(kind, []))
+
+    @property
+    def buns(self):
+        return self.by_type("bun")
+
+    @property
+    def mains(self):
+        return self.by_type("main")
+
+    @property
+    def sauces(self):
+        return self.by_type("sauce")
+
+    def ids(self):
+        return [item["_id"] for item in self.items]
+
+
+class IngredientCache:
+    """Thread-safe TTL cache around a fetch function, backed by an optional snapshot file"""
+
+    def __init__(self, fetch, base_url, ttl=3600, snapshot_path=None):
+        self._fetch = fetch  # returns the list of ingredient dicts
+        self.base_url = base_url
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self._catalogue = None
+        self._lock = threading.Lock()
+
+    def _fresh(self, catalogue):
+        return catalogue is not None and time.time() - catalogue.fetched_at < self.ttl
+
+    def get(self, refresh=False, fetch=None):
+        """Return the catalogue, fetching it only when missing or expired.
+
+        fetch overrides the cache's own fetch function, so a shared cache
+        refreshes through the transport of the client asking for it.
+        """
+        with self._lock:
+            if not refresh and self._catalogue is None:
+                self._catalogue = self._load_snapshot()
+            if refresh or not self._fresh(self._catalogue):
+                self._catalogue = IngredientCatalogue((fetch or self._fetch)())
+                self._save_snapshot(self._catalogue)
+            return self._catalogue
+
+    def invalidate(self):
+        with self._lock:
+            self._catalogue = None
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as snapshot:
+                data = json.load(snapshot)
+        except (OSError, ValueError):
+            return None
+        # Ingredient ids differ between services, e.g. the stand-in and production
+        if data.get("base_url") != self.base_url:
+            return None
+        return IngredientCatalogue(data["data"], fetched_at=data["fetched_at"])
+
+    def _save_snapshot(self, catalogue):
+        if not self.snapshot_path:
+            return
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as snapshot:
+            json.dump(
+                {"base_url": self.base_url, "fetched_at": catalogue.fetched_at, "data": catalogue.items},
+                snapshot,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.snapshot_path)  # atomic, safe with parallel workers
+
+
+_caches = {}  # (base_url, snapshot_path) -> IngredientCache
+_caches_lock = threading.Lock()
+
+
+def shared_cache(base_url, fetch, ttl=3600, snapshot_path=None):
+    """Return the process-wide cache for base_url and snapshot_path, creating it on first use.
+
+    Raises ValueError when the cache already exists with another ttl.
+    """
+    with _caches_lock:
+        cache = _caches.get((base_url, snapshot_path))
+        if cache is None:
+            cache = _caches[(base_url, snapshot_path)] = IngredientCache(fetch, base_url, ttl, snapshot_path)
+        elif cache.ttl != ttl:
+            raise ValueError(
+                f"Ingredient cache for {base_url} already uses ttl={cache.ttl}, not {ttl}"
+            )
+        return cache
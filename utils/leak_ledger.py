@@ -0,0 +1,80 @@
+"""Ledger of test users whose cleanup failed.
+
+cleanup_users() appends every user it could not delete; the next run sweeps
+the ledger (see utils/pytest_plugin.py) so leaked accounts do not pile up on the shared
+service.
+"""
+import json
+import os
+import threading
+import time
+
+from utils.user_data import TrackedUser
+
+
+class LeakLedger:
+    """Append-only JSON-lines file of leaked users"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, base_url, user, reason):
+        """Append a TrackedUser that could not be deleted"""
+        entry = {
+            "base_url": base_url,
+            "email": user.email,
+            "password": user.password,
+            "reason": reason,
+            "at": int(time.time()),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            # One O_APPEND write per entry, so parallel workers never interleave lines
+            with open(self.path, "a", encoding="utf-8") as ledger:
+                ledger.write(line)
+
+    def entries(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as ledger:
+            return [json.loads(line) for line in ledger if line.strip()]
+
+    def sweep(self, client):
+        """Try to delete the leaked users of client's base URL; keep the rest.
+
+        Returns the number of accounts purged.
+        """
+        entries = self.entries()
+        if not entries:
+            return 0
+        remaining, users = [], []
+        for entry in entries:
+            if entry["base_url"] == client.urls.base_url and entry.get("password"):
+                users.append(TrackedUser(entry["email"], entry["password"]))
+            else:
+                remaining.append(entry)
+        failures = client.delete_users(users)
+        # 401 on login: the account is already gone (or unreachable for good), drop it
+        failed = {failure.user.email for failure in failures if failure.login_status != 401}
+        remaining.extend(entry for entry in entries if entry["email"] in failed)
+        with self._lock:
+            if remaining:
+                with open(self.path, "w", encoding="utf-8") as ledger:
+                    ledger.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in remaining)
+            else:
+                os.remove(self.path)
+        return len(users) - len(failed)
+
+
+_ledgers = {}
+
+
+def get_ledger(path):
+    """Return the process-wide ledger for path (None when disabled)"""
+    if not path:
+        return None
+    ledger = _ledgers.get(path)
+    if ledger is None:
+        ledger = _ledgers.setdefault(path, LeakLedger(path))
+    return ledger
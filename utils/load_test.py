@@ -0,0 +1,277 @@
+"""Load and soak test mode for order creation.
+
+Virtual users create orders and read their order history against the
+configured base URL. Results are reported per endpoint (throughput, error
+rate, p50/p95/p99 latency) and written to a JSON file. Every response is
+checked against its declared schema (utils/schemas.py); a mismatch counts
+as an error and the first few are kept in the report with their JSON paths.
+
+Scenarios:
+    users     N virtual users loop for the whole duration
+    ramp      like users, but virtual users start evenly over --ramp-up seconds
+    constant  iterations start at a fixed --rate per second (open model)
+
+Examples:
+    python -m utils.load_test --stand-in --scenario users --users 20 --duration 30
+    python -m utils.load_test --scenario constant --rate 5 --duration 600 --output soak.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+
+from utils.schemas import get_registry
+from utils.settings import get_settings
+
+
+SCENARIOS = ("users", "ramp", "constant")
+SCHEMA_SAMPLES = 5  # schema failures kept per endpoint in the report
+LATENCY_SAMPLES = 10000  # latencies kept per endpoint for percentiles
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    """Latencies and outcomes of one endpoint.
+
+    Count, min and max are exact; percentiles come from a uniform reservoir
+    sample of at most LATENCY_SAMPLES latencies, so a soak of any length uses
+    the same memory.
+    """
+
+    def __init__(self, samples=LATENCY_SAMPLES, rng=None):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.latencies = []  # reservoir sample
+        self.samples = samples
+        self._rng = rng or random.Random()
+        self.statuses = Counter()
+        self.errors = 0
+        self.schema_errors = 0
+        self.schema_samples = []
+
+    def record(self, elapsed, status, schema_errors=None):
+        """Record one call; status is None when the request raised"""
+        self.count += 1
+        self.min = elapsed if self.min is None else min(self.min, elapsed)
+        self.max = elapsed if self.max is None else max(self.max, elapsed)
+        if len(self.latencies) < self.samples:
+            self.latencies.append(elapsed)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.samples:
+                self.latencies[slot] = elapsed
+        self.statuses[str(status)] += 1
+        if schema_errors:
+            self.schema_errors += 1
+            if len(self.schema_samples) < SCHEMA_SAMPLES:
+                self.schema_samples.append(schema_errors)
+        if status is None or status >= 400 or schema_errors:
+            self.errors += 1
+
+    def summary(self, duration):
+        latencies = sorted(self.latencies)
+        count = self.count
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / duration, 2) if duration else 0.0,
+            "latency_ms": {
+                "min": ms(self.min),
+                "p50": ms(percentile(latencies, 50)),
+                "p95": ms(percentile(latencies, 95)),
+                "p99": ms(percentile(latencies, 99)),
+                "max": ms(self.max),
+            },
+            "statuses": dict(self.statuses),
+            "schema_errors": self.schema_errors,
+            "schema_samples": list(self.schema_samples),
+        }
+
+
+class LoadTest:
+    """Drive order creation and order history reads with virtual users"""
+
+    def __init__(self, client, scenario="users", users=10, duration=10.0, rate=None, ramp_up=0.0):
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {scenario!r}, expected one of {SCENARIOS}")
+        if scenario == "constant" and not rate:
+            raise ValueError("The constant scenario needs a rate")
+        self.client = client
+        self.scenario = scenario
+        self.users = users
+        self.duration = duration
+        self.rate = rate
+        self.ramp_up = ramp_up
+        self.stats = {}
+        self.setup_stats = {}  # registration, kept out of the measured window
+        self.schemas = get_registry()  # validation is always on under load
+        self._deadline = None
+
+    async def _timed(self, endpoint, call, stats=None):
+        stats = self.stats if stats is None else stats
+        started = time.perf_counter()
+        try:
+            response = await call
+        except Exception:
+            stats.setdefault(endpoint, EndpointStats()).record(time.perf_counter() - started, None)
+            return None
+        elapsed = time.perf_counter() - started
+        method, path = endpoint.split(" ", 1)
+        schema_errors = self.schemas.validate_response(method, path, response)
+        stats.setdefault(endpoint, EndpointStats()).record(elapsed, response.status_code, schema_errors)
+        return response
+
+    async def _iteration(self, user, ingredients):
+        await self._timed("POST /api/orders", user.create_order(ingredients))
+        await self._timed("GET /api/orders", user.get_user_orders())
+
+    async def _virtual_user(self, user, ingredients, start_delay):
+        await asyncio.sleep(start_delay)
+        while time.monotonic() < self._deadline:
+            await self._iteration(user, ingredients)
+
+    async def _setup(self):
+        response = await self.client.get_ingredients()
+        items = response.json()["data"]
+        buns = [item["_id"] for item in items if item["type"] == "bun"]
+        fillings = [item["_id"] for item in items if item["type"] != "bun"]
+        ingredients = [buns[0], fillings[0], buns[0]]
+        users = [self.client.fork() for _ in range(self.users)]
+        responses = await asyncio.gather(
+            *(self._timed("POST /api/auth/register", user.register_user(), self.setup_stats) for user in users)
+        )
+        registered = [user for user, resp in zip(users, responses) if resp is not None and resp.status_code == 200]
+        if not registered:
+            raise RuntimeError("No virtual user could be registered")
+        return registered, ingredients
+
+    async def run(self):
+        """Run the scenario and return the report.
+
+        Registered users are deleted even when the scenario raises or is cancelled.
+        """
+        setup_started = time.monotonic()
+        try:
+            users, ingredients = await self._setup()
+            started = time.monotonic()
+            setup_elapsed = started - setup_started
+            self._deadline = started + self.duration
+            if self.scenario == "constant":
+                await self._constant_rate(users, ingredients, started)
+            else:
+                ramp_up = self.ramp_up if self.scenario == "ramp" else 0.0
+                step = ramp_up / len(users)
+                await asyncio.gather(
+                    *(self._virtual_user(user, ingredients, index * step) for index, user in enumerate(users))
+                )
+            elapsed = time.monotonic() - started
+        finally:
+            cleanup_errors = await self.client.cleanup_users()
+        return self.report(elapsed, setup_elapsed, cleanup_errors)
+
+    async def _constant_rate(self, users, ingredients, started):
+        tasks = set()  # only the iterations in flight, however long the soak
+        errors = []
+
+        def finished(task):
+            tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                errors.append(task.exception())
+
+        interval = 1.0 / self.rate
+        index = 0
+        try:
+            while time.monotonic() < self._deadline and not errors:
+                task = asyncio.ensure_future(self._iteration(users[index % len(users)], ingredients))
+                tasks.add(task)
+                task.add_done_callback(finished)
+                index += 1
+                await asyncio.sleep(max(0.0, started + index * interval - time.monotonic()))
+            await asyncio.gather(*tasks)
+            if errors:
+                raise errors[0]
+        finally:
+            for task in list(tasks):
+                task.cancel()
+
+    def report(self, elapsed, setup_elapsed=0.0, cleanup_errors=()):
+        return {
+            "base_url": self.client.urls.base_url,
+            "scenario": self.scenario,
+            "users": self.users,
+            "rate": self.rate,
+            "ramp_up": self.ramp_up,
+            "duration_s": round(elapsed, 3),
+            "endpoints": {endpoint: stats.summary(elapsed) for endpoint, stats in sorted(self.stats.items())},
+            "setup": {endpoint: stats.summary(setup_elapsed) for endpoint, stats in sorted(self.setup_stats.items())},
+            "cleanup_errors": list(cleanup_errors),
+        }
+
+
+def format_report(report):
+    lines = [
+        f"{report['scenario']} scenario against {report['base_url']} for {report['duration_s']}s",
+        f"{'endpoint':<26}{'requests':>9}{'rps':>9}{'errors':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}",
+    ]
+    for endpoint, summary in report["endpoints"].items():
+        latency = summary["latency_ms"]
+        lines.append(
+            f"{endpoint:<26}{summary['requests']:>9}{summary['throughput_rps']:>9}"
+            f"{summary['error_rate']:>9.2%}{latency['p50']!s:>9}{latency['p95']!s:>9}{latency['p99']!s:>9}"
+        )
+    return "\n".join(lines)
+
+
+async def run_load_test(base_url=None, **options):
+    from utils.async_api_client import AsyncStellarBurgersAPI  # httpx, only when a load test runs
+    async with AsyncStellarBurgersAPI(base_url=base_url) as client:
+        return await LoadTest(client, **options).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test Stellar Burgers order creation")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="users")
+    parser.add_argument("--users", type=int, default=10, help="virtual users")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--rate", type=float, help="iterations per second (constant scenario)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds to start all users (ramp scenario)")
+    parser.add_argument("--base-url", help="defaults to STELLAR_BURGERS_BASE_URL")
+    parser.add_argument("--stand-in", action="store_true", help="run against a local stand-in server")
+    parser.add_argument("--output", default="load-test-results.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    options = dict(scenario=args.scenario, users=args.users, duration=args.duration,
+                   rate=args.rate, ramp_up=args.ramp_up)
+    from utils.stand_in import StandInServer
+    server = StandInServer().start() if args.stand_in else None
+    try:
+        base_url = server.url if server else args.base_url or get_settings().base_url
+        report = asyncio.run(run_load_test(base_url, **options))
+    finally:
+        if server:
+            server.stop()
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(format_report(report))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
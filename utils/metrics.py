@@ -0,0 +1,158 @@
+"""Per-request timing for the API clients.
+
+Every request made by StellarBurgersAPI and AsyncStellarBurgersAPI is passed
+to the client's hooks as a RequestRecord. The default hook aggregates the
+records per endpoint for the whole process; utils/pytest_plugin.py reports them.
+Memory stays flat however long the run: totals are counters, and the
+records of the running test are a ring buffer of the latest ones.
+"""
+import contextvars
+import heapq
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+
+class RequestRecord:
+    """One finished (or failed) request"""
+
+    __slots__ = ("method", "endpoint", "status", "bytes", "elapsed", "phase")
+
+    def __init__(self, method, endpoint, status, bytes, elapsed, phase=None):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = status  # None when the request raised
+        self.bytes = bytes
+        self.elapsed = elapsed  # seconds
+        self.phase = phase
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class EndpointTotals:
+    __slots__ = ("count", "errors", "total", "max", "bytes")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+
+def endpoint_of(url):
+    """Path part of a request URL, e.g. /api/orders"""
+    return urlsplit(url).path
+
+
+class RequestMetrics:
+    """Process-wide aggregation of RequestRecords per endpoint and per test phase"""
+
+    def __init__(self, slowest=10, history=1000):
+        self._lock = threading.Lock()
+        self.slowest_size = slowest
+        self.history_size = history
+        # Set by utils/pytest_plugin.py to "setup", "call" or "teardown". A context variable, so a
+        # background thread started by a test does not pick up the phase the main
+        # thread happens to be in; pools working for the caller use map_in_context().
+        self._phase = contextvars.ContextVar(f"request_phase_{id(self)}", default=None)
+        self.reset()
+
+    @property
+    def phase(self):
+        return self._phase.get()
+
+    @phase.setter
+    def phase(self, phase):
+        self._phase.set(phase)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            self.phase_totals = {}
+            self._slowest = []  # min-heap of (elapsed, sequence, record)
+            self._sequence = 0
+            self.current = deque(maxlen=self.history_size)  # latest records of the running test, for Allure
+            self.dropped = 0  # records pushed out of current since the last take_current()
+
+    def __call__(self, record):
+        record.phase = self.phase
+        key = f"{record.method} {record.endpoint}"
+        with self._lock:
+            totals = self.endpoints.get(key)
+            if totals is None:
+                totals = self.endpoints[key] = EndpointTotals()
+            totals.count += 1
+            totals.total += record.elapsed
+            totals.bytes += record.bytes
+            if record.elapsed > totals.max:
+                totals.max = record.elapsed
+            if record.status is None or record.status >= 400:
+                totals.errors += 1
+            self.phase_totals[record.phase] = self.phase_totals.get(record.phase, 0.0) + record.elapsed
+            self._sequence += 1
+            entry = (record.elapsed, self._sequence, record)
+            if len(self._slowest) < self.slowest_size:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+            if len(self.current) == self.history_size:
+                self.dropped += 1
+            self.current.append(record)
+
+    def take_current(self):
+        """Return and forget the records collected since the last call (at most the latest history_size)"""
+        with self._lock:
+            records = list(self.current)
+            self.current.clear()
+            self.dropped = 0
+        return records
+
+    def slowest(self):
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+    def snapshot(self):
+        """Plain-data view, e.g. to send from an xdist worker to the controller"""
+        with self._lock:
+            return {
+                "endpoints": {key: {name: getattr(totals, name) for name in EndpointTotals.__slots__}
+                              for key, totals in self.endpoints.items()},
+                "phases": dict(self.phase_totals),
+                "slowest": [entry[2].as_dict() for entry in self._slowest],
+            }
+
+    def merge(self, snapshot):
+        """Add a snapshot() taken in another process"""
+        for key, data in snapshot["endpoints"].items():
+            with self._lock:
+                totals = self.endpoints.get(key)
+                if totals is None:
+                    totals = self.endpoints[key] = EndpointTotals()
+                totals.count += data["count"]
+                totals.errors += data["errors"]
+                totals.total += data["total"]
+                totals.bytes += data["bytes"]
+                totals.max = max(totals.max, data["max"])
+        with self._lock:
+            for phase, total in snapshot["phases"].items():
+                self.phase_totals[phase] = self.phase_totals.get(phase, 0.0) + total
+            for data in snapshot["slowest"]:
+                self._sequence += 1
+                entry = (data["elapsed"], self._sequence, RequestRecord(**data))
+                if len(self._slowest) < self.slowest_size:
+                    heapq.heappush(self._slowest, entry)
+                elif entry > self._slowest[0]:
+                    heapq.heapreplace(self._slowest, entry)
+
+
+def map_in_context(executor, fn, items):
+    """executor.map() running every call in a copy of the caller's context, e.g. its test phase"""
+    items = list(items)
+    contexts = [contextvars.copy_context() for _ in items]
+    return executor.map(lambda context, item: context.run(fn, item), contexts, items)
+
+
+# Installed as a hook on every client by default
+request_metrics = RequestMetrics()
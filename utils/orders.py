@@ -0,0 +1,170 @@
+"""Lazily parsed order feeds (GET /api/orders and /api/orders/all).
+
+The response body is read in chunks and the "orders" array is decoded one
+element at a time, so iterating a feed holds a single order in memory no
+matter how large the body is. The service has no pagination: both feeds
+return the latest 50 orders plus the total and totalToday counters; limit
+stops reading (and drops the connection) after that many orders.
+"""
+import codecs
+import json
+import re
+
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+class Order:
+    """One order of a feed"""
+
+    __slots__ = ("id", "number", "status", "name", "ingredients", "created_at", "updated_at")
+
+    def __init__(self, id, number, status, name, ingredients, created_at, updated_at):
+        self.id = id
+        self.number = number
+        self.status = status
+        self.name = name
+        self.ingredients = ingredients  # tuple of ingredient _ids
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data["_id"], data["number"], data["status"], data.get("name"),
+            tuple(data["ingredients"]), data["createdAt"], data["updatedAt"],
+        )
+
+    def __repr__(self):
+        return f"Order(number={self.number}, status={self.status!r}, ingredients={len(self.ingredients)})"
+
+
+class _JsonReader:
+    """Decodes consecutive JSON tokens from an iterable of text chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Next non-whitespace character"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON body")
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode one complete JSON value, reading more chunks until it is whole"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+                # A value ending at the buffer end may be cut short (a number or a literal)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_feed(chunks, fields):
+    """Yield the elements of the top-level "orders" array; other top-level keys go to fields"""
+    reader = _JsonReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "orders":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            fields[key] = reader.value()
+        if reader.expect(",}") == "}":
+            return
+
+
+def _text_chunks(response, chunk_size):
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    for chunk in response.iter_content(chunk_size):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+class OrderFeed:
+    """Iterable of the Orders in a streamed feed response.
+
+    total and total_today are known once the feed has been read to the end
+    (the service sends them after the orders). Iterate once; use it as a
+    context manager, or call close(), when stopping early.
+    """
+
+    def __init__(self, response, limit=None, chunk_size=CHUNK_SIZE):
+        self.response = response
+        self.limit = limit
+        self.chunk_size = chunk_size
+        self.fields = {}
+
+    @property
+    def total(self):
+        return self.fields.get("total")
+
+    @property
+    def total_today(self):
+        return self.fields.get("totalToday")
+
+    def __iter__(self):
+        try:
+            if self.limit == 0:
+                return
+            count = 0
+            for data in iter_feed(_text_chunks(self.response, self.chunk_size), self.fields):
+                yield Order.from_json(data)
+                count += 1
+                if count == self.limit:
+                    return
+            if self.fields.get("success") is False:
+                raise ValueError(f"Orders feed returned success=false: {self.fields.get('message')}")
+        finally:
+            self.close()
+
+    def close(self):
+        self.response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,391 @@
+"""pytest hooks of the suite: options, settings, stand-in, xdist, reports.
+
+Registered from conftest.py through pytest_plugins; the fixtures stay in
+conftest.py. Like conftest.py it imports no HTTP stack at module level (see
+--startup-profile).
+"""
+import json
+import time
+import uuid
+
+import allure
+import pytest
+
+from utils.api_client import StellarBurgersAPI
+from utils.cassette import MODES as CASSETTE_MODES
+from utils.cleanup_report import cleanup_report
+from utils.leak_ledger import get_ledger
+from utils.metrics import request_metrics
+from utils.schemas import get_registry, validation_report
+from utils.settings import get_settings
+from utils.startup_profile import import_timer
+from utils.user_data import set_user_namespace
+
+
+stand_in_key = pytest.StashKey()
+startup_key = pytest.StashKey()
+swept_key = pytest.StashKey()
+tracer_key = pytest.StashKey()
+impact_cache_key = pytest.StashKey()
+cached_result_key = pytest.StashKey()
+
+IMPACT_CACHE = "stellar-burgers/impact"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stellar-burgers", "Stellar Burgers API client")
+    group.addoption("--base-url", help="API base URL (env STELLAR_BURGERS_BASE_URL)")
+    group.addoption(
+        "--stand-in", action="store_true", default=None,
+        help="run against a local stand-in server (env STELLAR_BURGERS_STAND_IN=1)",
+    )
+    group.addoption("--http-timeout", type=float, help="per-request timeout in seconds")
+    group.addoption("--http-retries", type=int, help="retries for connection errors and 502/503/504")
+    group.addoption("--http-pool-size", type=int, help="keep-alive connections per host")
+    group.addoption(
+        "--cassettes", choices=CASSETTE_MODES,
+        help="record API calls per test, replay them offline, or auto (env STELLAR_BURGERS_CASSETTES)",
+    )
+    group.addoption("--cassette-dir", help="where cassettes are stored (default: cassettes)")
+    group.addoption(
+        "--slowest-calls", type=int, default=10,
+        help="show the N slowest API calls in the request timing summary (0 to hide the summary)",
+    )
+    group.addoption("--dataset-users", type=int, default=3, help="users in the order_history dataset")
+    group.addoption("--dataset-orders", type=int, default=10, help="orders per user in the order_history dataset")
+    group.addoption("--dataset-seed", type=int, default=2024, help="seed of the generated test data")
+    group.addoption(
+        "--validate-responses", choices=("off", "warn", "strict"),
+        help="check every response against its declared schema: report mismatches (warn) "
+             "or fail the call (strict) (env STELLAR_BURGERS_VALIDATE_RESPONSES)",
+    )
+    group.addoption(
+        "--rate-limit", type=float,
+        help="requests per second to the service, split between xdist workers; 0 for none "
+             "(env STELLAR_BURGERS_RATE_LIMIT)",
+    )
+    group.addoption(
+        "--impact", action="store_true",
+        help="rerun only tests that failed last time or whose code changed; reuse cached passes for the rest",
+    )
+    group.addoption(
+        "--startup-profile", type=int, nargs="?", const=15, default=0, metavar="N",
+        help="show the N slowest imports and test modules to collect (default 15); profiles this process, "
+             "so run it without -n",
+    )
+    group.addoption(
+        "--ingredients-snapshot",
+        help="JSON file the ingredient catalogue is persisted to (env STELLAR_BURGERS_INGREDIENTS_SNAPSHOT)",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("startup_profile"):
+        config.stash[startup_key] = time.process_time()  # CPU time of everything before this hook
+        import_timer.phase = "configure"
+        import_timer.install()
+    settings = get_settings().update(
+        base_url=config.getoption("base_url"),
+        stand_in=config.getoption("stand_in"),
+        timeout=config.getoption("http_timeout"),
+        retries=config.getoption("http_retries"),
+        pool_size=config.getoption("http_pool_size"),
+        ingredients_snapshot=config.getoption("ingredients_snapshot"),
+        cassettes=config.getoption("cassettes"),
+        cassette_dir=config.getoption("cassette_dir"),
+        validate_responses=config.getoption("validate_responses"),
+        rate_limit=config.getoption("rate_limit"),
+    )
+    if settings.validate_responses != "off":
+        get_registry()  # compile the schemas once, before any test runs
+    if config.getoption("impact"):
+        from utils.impact import DependencyTracer, Fingerprints
+        # Started before the stand-in, so its request threads are traced too
+        tracer = DependencyTracer(Fingerprints(str(config.rootpath)))
+        tracer.start()
+        config.stash[tracer_key] = tracer
+        config.stash[impact_cache_key] = config.cache.get(IMPACT_CACHE, {})
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        # pytest-xdist worker: share the controller's stand-in and namespace users per worker
+        settings.base_url = workerinput.get("stand_in_url") or settings.base_url
+        settings.rate_limit /= workerinput.get("workercount", 1)  # the limit is for the whole run
+        set_user_namespace(f"{workerinput['testrunuid'][:6]}_{workerinput['workerid']}")
+    else:
+        set_user_namespace(uuid.uuid4().hex[:6])
+    if settings.stand_in or settings.cassettes != "off":
+        settings.leak_ledger = None  # nothing is leaked on a shared service
+    if workerinput is not None:
+        return
+    if settings.stand_in:
+        from utils.stand_in import StandInServer
+        server = StandInServer(port=settings.stand_in_port).start()
+        config.stash[stand_in_key] = server
+        settings.base_url = server.url
+
+
+def _sweep_leaked_users(config):
+    """Delete the users leaked by earlier runs, once, before the first test"""
+    if swept_key in config.stash:
+        return
+    config.stash[swept_key] = 0
+    ledger = get_ledger(get_settings().leak_ledger)
+    if ledger is not None and ledger.entries():
+        config.stash[swept_key] = ledger.sweep(StellarBurgersAPI())
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    # Not in pytest_configure: --help, --collect-only and empty selections make no API calls
+    config = session.config
+    if hasattr(config, "workerinput") or config.option.collectonly or not session.items:
+        return
+    if session.testsfailed and not config.option.continue_on_collection_errors:
+        return  # collection errors: pytest stops before the first test
+    _sweep_leaked_users(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """pytest-xdist controller: sweep once a worker has collected tests, before they are scheduled"""
+    if ids:
+        _sweep_leaked_users(node.config)
+
+
+def pytest_unconfigure(config):
+    import_timer.uninstall()
+    tracer = config.stash.get(tracer_key, None)
+    if tracer is not None:
+        tracer.stop()
+    server = config.stash.get(stand_in_key, None)
+    if server is not None:
+        server.stop()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """pytest-xdist controller: point every worker at the same stand-in"""
+    server = node.config.stash.get(stand_in_key, None)
+    if server is not None:
+        node.workerinput["stand_in_url"] = server.url
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """pytest-xdist controller: collect cleanup failures, request timings and schema failures of a finished worker"""
+    cleanup_report.extend(node.workeroutput.get("cleanup_errors", []), node.workeroutput.get("cleanup_count"))
+    if "request_metrics" in node.workeroutput:
+        request_metrics.merge(node.workeroutput["request_metrics"])
+    if "schema_failures" in node.workeroutput:
+        validation_report.merge(node.workeroutput["schema_failures"])
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    # trylast: session fixtures (user pool, clients) are torn down by then
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None:
+        workeroutput["cleanup_errors"] = cleanup_report.errors
+        workeroutput["cleanup_count"] = cleanup_report.count
+        workeroutput["request_metrics"] = request_metrics.snapshot()
+        workeroutput["schema_failures"] = validation_report.snapshot()
+    elif tracer_key in session.config.stash:
+        # Tests that were not run this time (deselected, -k) keep their entries
+        cache = dict(session.config.stash[impact_cache_key])
+        for nodeid, entry in impact_results.items():
+            if entry is not None:
+                cache[nodeid] = entry
+        session.config.cache.set(IMPACT_CACHE, cache)
+
+
+def _track_phase(phase):
+    request_metrics.phase = phase
+    try:
+        return (yield)
+    finally:
+        request_metrics.phase = None
+
+
+def _impact_target(settings):
+    target = "stand-in" if settings.stand_in else settings.base_url
+    return target if settings.cassettes == "off" else f"{target} (cassettes {settings.cassettes})"
+
+
+def _test_file(item):
+    return item.path.relative_to(item.config.rootpath).as_posix()
+
+
+def pytest_collection(session):
+    import_timer.phase = "collection"
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_make_collect_report(collector):
+    if startup_key not in collector.config.stash or not isinstance(collector, pytest.Module):
+        return (yield)
+    started = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        collection_times[_test_file(collector)] = time.perf_counter() - started
+
+
+def pytest_collection_finish(session):
+    import_timer.phase = "tests"
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    tracer = request.config.stash.get(tracer_key, None)
+    if tracer is None:
+        return (yield)
+    saved = tracer.begin_fixture()
+    try:
+        return (yield)
+    finally:
+        tracer.end_fixture(fixturedef.argname, saved)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_setup(item):
+    tracer = item.config.stash.get(tracer_key, None)
+    if tracer is not None:
+        from utils.impact import unchanged
+        entry = item.config.stash[impact_cache_key].get(item.nodeid)
+        if entry and unchanged(entry, tracer.fingerprints, _test_file(item), _impact_target(get_settings())):
+            item.stash[cached_result_key] = entry
+            allure.dynamic.tag("cached")
+            pytest.skip(f"cached: passed at {entry['at']} and nothing it depends on changed")
+        tracer.begin_test()
+    return (yield from _track_phase("setup"))
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    return (yield from _track_phase("call"))
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    try:
+        return (yield from _track_phase("teardown"))
+    finally:
+        dropped = request_metrics.dropped
+        records = request_metrics.take_current()
+        if records and item.config.getoption("allure_report_dir", None):
+            allure.attach(
+                json.dumps([record.as_dict() for record in records], indent=2),
+                name=f"API calls (latest {len(records)}, {dropped} earlier dropped)" if dropped else "API calls",
+                attachment_type=allure.attachment_type.JSON,
+            )
+        tracer = item.config.stash.get(tracer_key, None)
+        if tracer is not None:
+            # Reported with the teardown report, so pytest-xdist brings it to the controller
+            if cached_result_key in item.stash:
+                item.user_properties.append(("impact", {"cached": True}))
+            else:
+                item.user_properties.append(("impact", {
+                    "target": _impact_target(get_settings()),
+                    "file": tracer.fingerprints.file(_test_file(item)),
+                    "globals": tracer.fingerprints.global_files(),
+                    "dependencies": tracer.end_test(item.fixturenames),
+                    "endpoints": sorted({f"{record.method} {record.endpoint}" for record in records}),
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }))
+
+
+phase_durations = {}
+collection_times = {}  # test file -> seconds to import and collect it, with --startup-profile
+impact_outcomes = {}  # nodeid -> worst outcome of its phases so far
+impact_results = {}  # nodeid -> new cache entry, None when the cached result was reused
+OUTCOME_RANK = {"passed": 0, "skipped": 1, "failed": 2}
+
+
+def pytest_runtest_logreport(report):
+    phase_durations[report.when] = phase_durations.get(report.when, 0.0) + report.duration
+    outcome = max(report.outcome, impact_outcomes.get(report.nodeid, "passed"), key=OUTCOME_RANK.get)
+    impact_outcomes[report.nodeid] = outcome
+    if report.when != "teardown":
+        return
+    del impact_outcomes[report.nodeid]
+    entry = dict(report.user_properties).get("impact")
+    if entry is None:
+        return
+    if entry.get("cached"):
+        impact_results[report.nodeid] = None
+    else:
+        impact_results[report.nodeid] = dict(entry, outcome=outcome)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    swept = config.stash.get(swept_key, 0)
+    if swept:
+        terminalreporter.line(f"Purged {swept} user(s) leaked by earlier runs")
+    errors = cleanup_report.errors
+    if errors:
+        terminalreporter.section("cleanup failures")
+        for error in errors:
+            terminalreporter.line(error)
+        terminalreporter.line(f"{cleanup_report.count} test user(s) may have leaked")
+        if get_settings().leak_ledger:
+            terminalreporter.line(f"They are listed in {get_settings().leak_ledger} and purged on the next run")
+    if impact_results:
+        reused = sum(1 for entry in impact_results.values() if entry is None)
+        terminalreporter.line(
+            f"Test impact: {len(impact_results) - reused} test(s) ran, {reused} reused a cached pass"
+        )
+    if validation_report.count:
+        terminalreporter.section("schema mismatches")
+        for endpoint, schema_errors in validation_report.failures:
+            terminalreporter.line(f"{endpoint}: {'; '.join(schema_errors)}")
+        terminalreporter.line(f"{validation_report.count} response(s) did not match their schema")
+
+    if startup_key in config.stash:
+        _startup_profile_summary(terminalreporter, config)
+
+    slowest_calls = config.getoption("slowest_calls")
+    if slowest_calls <= 0 or not request_metrics.endpoints:
+        return
+    terminalreporter.section("API request timing")
+    terminalreporter.line(f"{'endpoint':<32}{'calls':>7}{'errors':>8}{'total s':>9}{'avg ms':>9}{'max ms':>9}{'KiB':>9}")
+    for key, totals in sorted(request_metrics.endpoints.items(), key=lambda item: -item[1].total):
+        terminalreporter.line(
+            f"{key:<32}{totals.count:>7}{totals.errors:>8}{totals.total:>9.2f}"
+            f"{totals.total / totals.count * 1000:>9.1f}{totals.max * 1000:>9.1f}{totals.bytes / 1024:>9.1f}"
+        )
+    terminalreporter.line("")
+    terminalreporter.line("slowest calls:")
+    for record in request_metrics.slowest()[:slowest_calls]:
+        terminalreporter.line(
+            f"{record.elapsed * 1000:>9.1f} ms  {record.method} {record.endpoint} -> {record.status} ({record.phase})"
+        )
+    phases = request_metrics.phase_totals
+    fixtures = phase_durations.get("setup", 0.0) + phase_durations.get("teardown", 0.0)
+    fixtures_api = phases.get("setup", 0.0) + phases.get("teardown", 0.0)
+    terminalreporter.line("")
+    terminalreporter.line(
+        f"fixtures: {fixtures:.2f}s ({fixtures_api:.2f}s in API calls); "
+        f"test bodies: {phase_durations.get('call', 0.0):.2f}s ({phases.get('call', 0.0):.2f}s in API calls)"
+    )
+
+
+def _startup_profile_summary(terminalreporter, config):
+    count = config.getoption("startup_profile")
+    terminalreporter.section("startup profile")
+    terminalreporter.line(
+        f"before pytest_configure: {config.stash[startup_key]:.2f}s CPU (interpreter, pytest, plugins, conftest.py; "
+        f"break it down with python -X importtime -m pytest)"
+    )
+    if collection_times:
+        terminalreporter.line(
+            f"collection: {sum(collection_times.values()):.2f}s for {len(collection_times)} test module(s)"
+        )
+    terminalreporter.line("")
+    terminalreporter.line(f"{'import':<48}{'total ms':>10}{'own ms':>9}  phase")
+    for record in import_timer.slowest(count):
+        terminalreporter.line(f"{record.name:<48}{record.total * 1000:>10.1f}{record.own * 1000:>9.1f}  {record.phase}")
+    if collection_times:
+        terminalreporter.line("")
+        terminalreporter.line(f"{'test module':<48}{'collect ms':>10}")
+        for path, elapsed in sorted(collection_times.items(), key=lambda item: -item[1])[:count]:
+            terminalreporter.line(f"{path:<48}{elapsed * 1000:>10.1f}")
@@ -0,0 +1,283 @@
+"""Declared response schemas and their compiled validators.
+
+Schemas are plain Python structures:
+    a type (str, int, float, bool, NUMBER)  isinstance check (bool is not an int)
+    a dict                                  object; listed keys are required,
+                                            wrap a value in Optional() to allow it missing
+    a one-element list [item]               array of item
+    Enum(...), Pattern(regex), Nullable(s)  as named
+    any other value                         must be equal (e.g. True)
+
+compile_schema() turns a schema into nested closures once, so validating a
+response is a handful of function calls per field and no interpretation.
+Errors carry JSON paths such as $.orders[3].number.
+"""
+import re
+import threading
+
+
+NUMBER = (int, float)
+
+
+class Optional:
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class Nullable:
+    def __init__(self, schema):
+        self.schema = schema
+
+
+class Enum:
+    def __init__(self, *values):
+        self.values = frozenset(values)
+
+
+class Pattern:
+    def __init__(self, regex):
+        self.regex = re.compile(regex)
+
+
+class SchemaValidationError(AssertionError):
+    """A response does not match its declared schema"""
+
+    def __init__(self, endpoint, errors):
+        self.endpoint = endpoint
+        self.errors = errors
+        super().__init__(f"{endpoint} response does not match its schema: " + "; ".join(errors))
+
+
+def _type_name(value):
+    return type(value).__name__
+
+
+def compile_schema(schema):
+    """Return validate(value, path, errors), appending "path: problem" strings to errors"""
+    if isinstance(schema, type) or (isinstance(schema, tuple) and all(isinstance(t, type) for t in schema)):
+        types = schema if isinstance(schema, tuple) else (schema,)
+        expected = " or ".join(t.__name__ for t in types)
+        allow_bool = bool in types
+
+        def validate_type(value, path, errors):
+            if not isinstance(value, types) or (isinstance(value, bool) and not allow_bool):
+                errors.append(f"{path}: expected {expected}, got {_type_name(value)}")
+        return validate_type
+
+    if isinstance(schema, dict):
+        fields = []
+        for key, value_schema in schema.items():
+            required = not isinstance(value_schema, Optional)
+            inner = value_schema.schema if not required else value_schema
+            fields.append((key, required, compile_schema(inner)))
+
+        def validate_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append(f"{path}: expected object, got {_type_name(value)}")
+                return
+            for key, required, validate in fields:
+                if key in value:
+                    validate(value[key], f"{path}.{key}", errors)
+                elif required:
+                    errors.append(f"{path}.{key}: missing")
+        return validate_object
+
+    if isinstance(schema, list):
+        validate_item = compile_schema(schema[0])
+
+        def validate_array(value, path, errors):
+            if not isinstance(value, list):
+                errors.append(f"{path}: expected array, got {_type_name(value)}")
+                return
+            for index, item in enumerate(value):
+                validate_item(item, f"{path}[{index}]", errors)
+        return validate_array
+
+    if isinstance(schema, Nullable):
+        validate_inner = compile_schema(schema.schema)
+
+        def validate_nullable(value, path, errors):
+            if value is not None:
+                validate_inner(value, path, errors)
+        return validate_nullable
+
+    if isinstance(schema, Enum):
+        values = schema.values
+
+        def validate_enum(value, path, errors):
+            if value not in values:
+                errors.append(f"{path}: {value!r} is not one of {sorted(values)}")
+        return validate_enum
+
+    if isinstance(schema, Pattern):
+        regex = schema.regex
+
+        def validate_pattern(value, path, errors):
+            if not isinstance(value, str) or not regex.match(value):
+                errors.append(f"{path}: {value!r} does not match {regex.pattern!r}")
+        return validate_pattern
+
+    def validate_constant(value, path, errors):
+        if value != schema or type(value) is not type(schema):
+            errors.append(f"{path}: expected {schema!r}, got {value!r}")
+    return validate_constant
+
+
+# Schemas
+
+OBJECT_ID = Pattern(r"^[0-9a-f]{24}$")
+ACCESS_TOKEN = Pattern(r"^Bearer \S+$")
+
+ERROR = {"success": False, "message": str}
+MESSAGE = {"success": True, "message": str}
+USER = {"email": str, "name": str}
+AUTH = {"success": True, "user": USER, "accessToken": ACCESS_TOKEN, "refreshToken": str}
+TOKENS = {"success": True, "accessToken": ACCESS_TOKEN, "refreshToken": str}
+USER_INFO = {"success": True, "user": USER}
+
+INGREDIENT = {
+    "_id": OBJECT_ID,
+    "name": str,
+    "type": Enum("bun", "main", "sauce"),
+    "proteins": NUMBER,
+    "fat": NUMBER,
+    "carbohydrates": NUMBER,
+    "calories": NUMBER,
+    "price": NUMBER,
+    "image": str,
+    "image_mobile": str,
+    "image_large": str,
+}
+INGREDIENTS = {"success": True, "data": [INGREDIENT]}
+
+CREATED_ORDER = {
+    "success": True,
+    "name": str,
+    "order": {
+        "number": int,
+        # Only orders created with a token come back in full
+        "_id": Optional(OBJECT_ID),
+        "ingredients": Optional([INGREDIENT]),
+        "status": Optional(str),
+        "price": Optional(NUMBER),
+    },
+}
+FEED_ORDER = {
+    "_id": OBJECT_ID,
+    "ingredients": [OBJECT_ID],
+    "status": str,
+    "name": Optional(str),
+    "number": int,
+    "createdAt": str,
+    "updatedAt": str,
+}
+ORDERS_FEED = {"success": True, "orders": [FEED_ORDER], "total": int, "totalToday": int}
+
+# (method, path) -> {status: schema}; "4xx" applies to any client error
+RESPONSE_SCHEMAS = {
+    ("POST", "/api/auth/register"): {200: AUTH, "4xx": ERROR},
+    ("POST", "/api/auth/login"): {200: AUTH, "4xx": ERROR},
+    ("POST", "/api/auth/logout"): {200: MESSAGE, "4xx": ERROR},
+    ("POST", "/api/auth/token"): {200: TOKENS, "4xx": ERROR},
+    ("GET", "/api/auth/user"): {200: USER_INFO, "4xx": ERROR},
+    ("PATCH", "/api/auth/user"): {200: USER_INFO, "4xx": ERROR},
+    ("DELETE", "/api/auth/user"): {200: MESSAGE, 202: MESSAGE, "4xx": ERROR},
+    ("GET", "/api/ingredients"): {200: INGREDIENTS},
+    ("POST", "/api/orders"): {200: CREATED_ORDER, "4xx": ERROR},
+    ("GET", "/api/orders"): {200: ORDERS_FEED, "4xx": ERROR},
+    ("GET", "/api/orders/all"): {200: ORDERS_FEED},
+    ("POST", "/api/password-reset"): {200: MESSAGE, "4xx": ERROR},
+    ("POST", "/api/password-reset/reset"): {200: MESSAGE, "4xx": ERROR},
+}
+
+
+class SchemaRegistry:
+    """Compiled validators for RESPONSE_SCHEMAS"""
+
+    def __init__(self, schemas=None):
+        self._validators = {
+            endpoint: {status: compile_schema(schema) for status, schema in by_status.items()}
+            for endpoint, by_status in (schemas or RESPONSE_SCHEMAS).items()
+        }
+
+    def validator(self, method, path, status):
+        by_status = self._validators.get((method, path))
+        if by_status is None:
+            return None
+        validate = by_status.get(status)
+        if validate is None and 400 <= status < 500:
+            validate = by_status.get("4xx")
+        return validate
+
+    def validate(self, method, path, status, body):
+        """Return the list of errors of a parsed body (empty when valid or undeclared)"""
+        validate = self.validator(method, path, status)
+        if validate is None:
+            return []
+        errors = []
+        validate(body, "$", errors)
+        return errors
+
+    def validate_response(self, method, path, response):
+        """Validate a requests/httpx response; a non-JSON body for a declared status is an error"""
+        validate = self.validator(method, path, response.status_code)
+        if validate is None:
+            return []
+        try:
+            body = response.json()
+        except ValueError:
+            return ["$: response is not JSON"]
+        errors = []
+        validate(body, "$", errors)
+        return errors
+
+
+class ValidationReport:
+    """Schema failures seen in warn mode, for the end-of-run summary"""
+
+    def __init__(self, limit=100):
+        self._lock = threading.Lock()
+        self.limit = limit
+        self.count = 0
+        self.failures = []
+
+    def add(self, endpoint, errors):
+        with self._lock:
+            self.count += 1
+            if len(self.failures) < self.limit:
+                self.failures.append((endpoint, errors))
+
+    def snapshot(self):
+        with self._lock:
+            return {"count": self.count, "failures": [list(failure) for failure in self.failures]}
+
+    def merge(self, snapshot):
+        """Add a snapshot() taken in another process (pytest-xdist worker)"""
+        with self._lock:
+            self.count += snapshot["count"]
+            room = self.limit - len(self.failures)
+            self.failures.extend(tuple(failure) for failure in snapshot["failures"][:max(room, 0)])
+
+
+validation_report = ValidationReport()
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Compile the schemas on first use and return the shared registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = SchemaRegistry()
+        return _registry
+
+
+def check_response(method, endpoint, response, mode):
+    """Validate the response of a client call: raise SchemaValidationError in strict mode, report it in warn mode"""
+    errors = get_registry().validate_response(method, endpoint, response)
+    if errors:
+        if mode == "strict":
+            raise SchemaValidationError(f"{method} {endpoint}", errors)
+        validation_report.add(f"{method} {endpoint}", errors)
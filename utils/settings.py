@@ -0,0 +1,85 @@
+"""Connection settings for StellarBurgersAPI.
+
+Defaults come from environment variables and can be overridden from the
+pytest command line (see utils/pytest_plugin.py) or per client.
+"""
+import os
+
+
+DEFAULT_BASE_URL = "https://stellarburgers.nomoreparties.site"
+
+
+def _env_flag(name, environ):
+    return environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+class ClientSettings:
+    """Base URL and transport tuning for the API client"""
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=10.0, retries=3,
+                 backoff_factor=0.3, pool_size=10, stand_in=False, stand_in_port=0,
+                 ingredients_ttl=3600.0, ingredients_snapshot=None, concurrency=100,
+                 cassettes="off", cassette_dir="cassettes", cleanup_workers=8,
+                 leak_ledger="leaked-users.jsonl", validate_responses="off", rate_limit=0.0,
+                 breaker_threshold=5, breaker_reset=30.0):
+        self.base_url = base_url
+        self.timeout = timeout  # seconds, applied to every request
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.stand_in = stand_in
+        self.stand_in_port = stand_in_port
+        self.ingredients_ttl = ingredients_ttl  # seconds the ingredient catalogue is reused
+        self.ingredients_snapshot = ingredients_snapshot  # JSON file that keeps the catalogue between runs
+        self.concurrency = concurrency  # in-flight requests and connections of the async client
+        self.cassettes = cassettes  # off, record, replay or auto (see utils/cassette.py)
+        self.cassette_dir = cassette_dir
+        self.cleanup_workers = cleanup_workers  # threads deleting users in cleanup_users()
+        self.leak_ledger = leak_ledger  # users that could not be deleted; None disables it
+        self.validate_responses = validate_responses  # off, warn or strict (see utils/schemas.py)
+        self.rate_limit = rate_limit  # requests per second per process; 0 disables it (see utils/throttle.py)
+        self.breaker_threshold = breaker_threshold  # consecutive failures that open the circuit; 0 disables it
+        self.breaker_reset = breaker_reset  # seconds before an open circuit lets a probe through
+
+    @classmethod
+    def from_env(cls, environ=None):
+        """Build settings from STELLAR_BURGERS_* environment variables"""
+        environ = os.environ if environ is None else environ
+        return cls(
+            base_url=environ.get("STELLAR_BURGERS_BASE_URL", DEFAULT_BASE_URL),
+            timeout=float(environ.get("STELLAR_BURGERS_TIMEOUT", "10")),
+            retries=int(environ.get("STELLAR_BURGERS_RETRIES", "3")),
+            backoff_factor=float(environ.get("STELLAR_BURGERS_BACKOFF", "0.3")),
+            pool_size=int(environ.get("STELLAR_BURGERS_POOL_SIZE", "10")),
+            stand_in=_env_flag("STELLAR_BURGERS_STAND_IN", environ),
+            stand_in_port=int(environ.get("STELLAR_BURGERS_STAND_IN_PORT", "0")),
+            ingredients_ttl=float(environ.get("STELLAR_BURGERS_INGREDIENTS_TTL", "3600")),
+            ingredients_snapshot=environ.get("STELLAR_BURGERS_INGREDIENTS_SNAPSHOT") or None,
+            concurrency=int(environ.get("STELLAR_BURGERS_CONCURRENCY", "100")),
+            cassettes=environ.get("STELLAR_BURGERS_CASSETTES", "off"),
+            cassette_dir=environ.get("STELLAR_BURGERS_CASSETTE_DIR", "cassettes"),
+            cleanup_workers=int(environ.get("STELLAR_BURGERS_CLEANUP_WORKERS", "8")),
+            leak_ledger=environ.get("STELLAR_BURGERS_LEAK_LEDGER", "leaked-users.jsonl") or None,
+            validate_responses=environ.get("STELLAR_BURGERS_VALIDATE_RESPONSES", "off"),
+            rate_limit=float(environ.get("STELLAR_BURGERS_RATE_LIMIT", "0")),
+            breaker_threshold=int(environ.get("STELLAR_BURGERS_BREAKER_THRESHOLD", "5")),
+            breaker_reset=float(environ.get("STELLAR_BURGERS_BREAKER_RESET", "30")),
+        )
+
+    def update(self, **overrides):
+        """Apply overrides, ignoring the ones left as None"""
+        for name, value in overrides.items():
+            if value is not None:
+                setattr(self, name, value)
+        return self
+
+
+_settings = None
+
+
+def get_settings():
+    """Return the process-wide default settings"""
+    global _settings
+    if _settings is None:
+        _settings = ClientSettings.from_env()
+    return _settings
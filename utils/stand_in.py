@@ -0,0 +1,392 @@
+"""Local stand-in for the Stellar Burgers API.
+
+Serves the endpoints used by StellarBurgersAPI on a loopback port so the
+suite can run offline. Status codes and messages mirror the real service.
+
+Run standalone with:
+    python -m utils.stand_in --port 8808
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import re
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+ACCESS_TOKEN_TTL = 20 * 60  # seconds, same as the real service
+ORDERS_FEED_LIMIT = 50  # the real feeds return only the latest 50 orders
+
+INGREDIENTS = [
+    {"_id": "61c0c5a71d1f82001bdaaa6d", "name": "Флюоресцентная булка R2-D3", "type": "bun", "price": 988},
+    {"_id": "61c0c5a71d1f82001bdaaa6c", "name": "Краторная булка N-200i", "type": "bun", "price": 1255},
+    {"_id": "61c0c5a71d1f82001bdaaa6f", "name": "Мясо бессмертных моллюсков Protostomia", "type": "main", "price": 1337},
+    {"_id": "61c0c5a71d1f82001bdaaa70", "name": "Говяжий метеорит (отбивная)", "type": "main", "price": 3000},
+    {"_id": "61c0c5a71d1f82001bdaaa71", "name": "Биокотлета из марсианской Магнолии", "type": "main", "price": 424},
+    {"_id": "61c0c5a71d1f82001bdaaa6e", "name": "Филе Люминесцентного тетраодонтимформа", "type": "main", "price": 988},
+    {"_id": "61c0c5a71d1f82001bdaaa76", "name": "Хрустящие минеральные кольца", "type": "main", "price": 300},
+    {"_id": "61c0c5a71d1f82001bdaaa77", "name": "Плоды Фалленианского дерева", "type": "main", "price": 874},
+    {"_id": "61c0c5a71d1f82001bdaaa78", "name": "Кристаллы марсианских альфа-сахаридов", "type": "main", "price": 762},
+    {"_id": "61c0c5a71d1f82001bdaaa79", "name": "Мини-салат Экзо-Плантаго", "type": "main", "price": 4400},
+    {"_id": "61c0c5a71d1f82001bdaaa7a", "name": "Сыр с астероидной плесенью", "type": "main", "price": 4142},
+    {"_id": "61c0c5a71d1f82001bdaaa72", "name": "Соус Spicy-X", "type": "sauce", "price": 90},
+    {"_id": "61c0c5a71d1f82001bdaaa73", "name": "Соус фирменный Space Sauce", "type": "sauce", "price": 80},
+    {"_id": "61c0c5a71d1f82001bdaaa74", "name": "Соус традиционный галактический", "type": "sauce", "price": 15},
+    {"_id": "61c0c5a71d1f82001bdaaa75", "name": "Соус с шипами Антарианского плоскоходца", "type": "sauce", "price": 88},
+]
+
+OBJECT_ID_RE = re.compile(r"^[0-9a-f]{24}$")
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class StandInState:
+    """In-memory users, tokens and orders behind the stand-in server"""
+
+    def __init__(self, access_token_ttl=ACCESS_TOKEN_TTL):
+        self.access_token_ttl = access_token_ttl
+        self._lock = threading.Lock()
+        self._secret = uuid.uuid4().bytes
+        self._users = {}  # user id -> {"email", "password", "name"}
+        self._ids_by_email = {}
+        self._refresh_tokens = {}  # refresh token -> user id
+        self._orders = []
+        self._ingredients = {item["_id"]: self._full_ingredient(item) for item in INGREDIENTS}
+        self._order_number = 10000
+
+    @staticmethod
+    def _full_ingredient(item):
+        return {
+            **item,
+            "proteins": 80,
+            "fat": 24,
+            "carbohydrates": 53,
+            "calories": 420,
+            "image": "https://code.s3.yandex.net/react/code/bun-02.png",
+            "image_mobile": "https://code.s3.yandex.net/react/code/bun-02-mobile.png",
+            "image_large": "https://code.s3.yandex.net/react/code/bun-02-large.png",
+            "__v": 0,
+        }
+
+    # Tokens
+
+    def _sign(self, payload):
+        return _b64(hmac.new(self._secret, payload.encode(), hashlib.sha256).digest())
+
+    def _issue_tokens(self, user_id):
+        now = int(time.time())
+        header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+        claims = _b64(json.dumps({"id": user_id, "iat": now, "exp": now + self.access_token_ttl}).encode())
+        signing_input = f"{header}.{claims}"
+        access_token = f"Bearer {signing_input}.{self._sign(signing_input)}"
+        refresh_token = uuid.uuid4().hex + uuid.uuid4().hex[:16]
+        self._refresh_tokens[refresh_token] = user_id
+        return access_token, refresh_token
+
+    def _authorise(self, headers):
+        """Return (user_id, None) or (None, error response)"""
+        token = headers.get("Authorization")
+        if not token:
+            return None, (401, {"success": False, "message": "You should be authorised"})
+        token = token[len("Bearer "):] if token.startswith("Bearer ") else token
+        parts = token.split(".")
+        if len(parts) != 3 or not hmac.compare_digest(self._sign(f"{parts[0]}.{parts[1]}"), parts[2]):
+            return None, (403, {"success": False, "message": "jwt malformed"})
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+        if claims["exp"] <= time.time():
+            return None, (403, {"success": False, "message": "jwt expired"})
+        if claims["id"] not in self._users:
+            return None, (404, {"success": False, "message": "User not found"})
+        return claims["id"], None
+
+    def _auth_body(self, user_id):
+        access_token, refresh_token = self._issue_tokens(user_id)
+        user = self._users[user_id]
+        return {
+            "success": True,
+            "user": {"email": user["email"], "name": user["name"]},
+            "accessToken": access_token,
+            "refreshToken": refresh_token,
+        }
+
+    # Auth
+
+    def register(self, body, headers):
+        email, password, name = body.get("email"), body.get("password"), body.get("name")
+        if not email or not password or not name:
+            return 403, {"success": False, "message": "Email, password and name are required fields"}
+        with self._lock:
+            if email in self._ids_by_email:
+                return 403, {"success": False, "message": "User already exists"}
+            user_id = uuid.uuid4().hex[:24]
+            self._users[user_id] = {"email": email, "password": password, "name": name}
+            self._ids_by_email[email] = user_id
+            return 200, self._auth_body(user_id)
+
+    def login(self, body, headers):
+        with self._lock:
+            user_id = self._ids_by_email.get(body.get("email"))
+            if user_id is None or self._users[user_id]["password"] != body.get("password"):
+                return 401, {"success": False, "message": "email or password are incorrect"}
+            return 200, self._auth_body(user_id)
+
+    def logout(self, body, headers):
+        with self._lock:
+            if self._refresh_tokens.pop(body.get("token"), None) is None:
+                return 404, {"success": False, "message": "Token required"}
+            return 200, {"success": True, "message": "Successful logout"}
+
+    def refresh_token(self, body, headers):
+        with self._lock:
+            user_id = self._refresh_tokens.pop(body.get("token"), None)
+            if user_id is None or user_id not in self._users:
+                return 401, {"success": False, "message": "Token is invalid"}
+            access_token, refresh_token = self._issue_tokens(user_id)
+            return 200, {"success": True, "accessToken": access_token, "refreshToken": refresh_token}
+
+    def get_user(self, body, headers):
+        with self._lock:
+            user_id, error = self._authorise(headers)
+            if error:
+                return error
+            user = self._users[user_id]
+            return 200, {"success": True, "user": {"email": user["email"], "name": user["name"]}}
+
+    def update_user(self, body, headers):
+        with self._lock:
+            user_id, error = self._authorise(headers)
+            if error:
+                return error
+            user = self._users[user_id]
+            new_email = body.get("email")
+            if new_email and new_email != user["email"]:
+                if new_email in self._ids_by_email:
+                    return 403, {"success": False, "message": "User with such email already exists"}
+                del self._ids_by_email[user["email"]]
+                self._ids_by_email[new_email] = user_id
+                user["email"] = new_email
+            for field in ("name", "password"):
+                if body.get(field):
+                    user[field] = body[field]
+            return 200, {"success": True, "user": {"email": user["email"], "name": user["name"]}}
+
+    def delete_user(self, body, headers):
+        with self._lock:
+            user_id, error = self._authorise(headers)
+            if error:
+                return error
+            user = self._users.pop(user_id)
+            del self._ids_by_email[user["email"]]
+            return 202, {"success": True, "message": "User successfully removed"}
+
+    # Ingredients and orders
+
+    def get_ingredients(self, body, headers):
+        return 200, {"success": True, "data": list(self._ingredients.values())}
+
+    def create_order(self, body, headers):
+        ingredient_ids = body.get("ingredients") or []
+        if not ingredient_ids:
+            return 400, {"success": False, "message": "Ingredient ids must be provided"}
+        if not all(isinstance(item, str) and OBJECT_ID_RE.match(item) for item in ingredient_ids):
+            return 500, None
+        if not all(item in self._ingredients for item in ingredient_ids):
+            return 400, {"success": False, "message": "One or more ids provided are incorrect"}
+        with self._lock:
+            owner_id = None
+            if headers.get("Authorization"):
+                owner_id, error = self._authorise(headers)
+                if error:
+                    return error
+            self._order_number += 1
+            name = " ".join(self._ingredients[item]["name"].split()[0] for item in ingredient_ids[:3]) + " бургер"
+            created_at = _now_iso()
+            order = {
+                "_id": uuid.uuid4().hex[:24],
+                "ingredients": list(ingredient_ids),
+                "owner": owner_id,
+                "status": "done",
+                "name": name,
+                "createdAt": created_at,
+                "updatedAt": created_at,
+                "number": self._order_number,
+            }
+            self._orders.append(order)
+            if owner_id is None:
+                return 200, {"success": True, "name": name, "order": {"number": order["number"]}}
+            owner = self._users[owner_id]
+            details = {
+                **order,
+                "ingredients": [self._ingredients[item] for item in ingredient_ids],
+                "owner": {"name": owner["name"], "email": owner["email"], "createdAt": created_at, "updatedAt": created_at},
+                "price": sum(self._ingredients[item]["price"] for item in ingredient_ids),
+            }
+            return 200, {"success": True, "name": name, "order": details}
+
+    def _orders_feed(self, orders):
+        today = datetime.now(timezone.utc).date().isoformat()
+        feed = [{key: value for key, value in order.items() if key != "owner"} for order in orders]
+        return {
+            "success": True,
+            "orders": feed[-ORDERS_FEED_LIMIT:],
+            "total": len(self._orders),
+            "totalToday": sum(1 for order in self._orders if order["createdAt"].startswith(today)),
+        }
+
+    def get_user_orders(self, body, headers):
+        with self._lock:
+            user_id, error = self._authorise(headers)
+            if error:
+                return error
+            return 200, self._orders_feed([order for order in self._orders if order["owner"] == user_id])
+
+    def get_all_orders(self, body, headers):
+        with self._lock:
+            return 200, self._orders_feed(self._orders)
+
+    # Password reset
+
+    def request_password_reset(self, body, headers):
+        if not body.get("email"):
+            return 400, {"success": False, "message": "Email is required"}
+        return 200, {"success": True, "message": "Reset email sent"}
+
+    def reset_password(self, body, headers):
+        # Reset tokens are only ever e-mailed, so any token sent here is unknown
+        return 404, {"success": False, "message": "Incorrect reset token"}
+
+
+ROUTES = {
+    ("POST", "/api/auth/register"): "register",
+    ("POST", "/api/auth/login"): "login",
+    ("POST", "/api/auth/logout"): "logout",
+    ("POST", "/api/auth/token"): "refresh_token",
+    ("GET", "/api/auth/user"): "get_user",
+    ("PATCH", "/api/auth/user"): "update_user",
+    ("DELETE", "/api/auth/user"): "delete_user",
+    ("GET", "/api/ingredients"): "get_ingredients",
+    ("POST", "/api/orders"): "create_order",
+    ("GET", "/api/orders"): "get_user_orders",
+    ("GET", "/api/orders/all"): "get_all_orders",
+    ("POST", "/api/password-reset"): "request_password_reset",
+    ("POST", "/api/password-reset/reset"): "reset_password",
+}
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the async client opens many connections at once
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    """Dispatch HTTP requests to StandInState"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real service
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _handle(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        handler_name = ROUTES.get((self.command, path))
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        if handler_name is None:
+            self._send(404, {"success": False, "message": "Not Found"})
+            return
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            self._send(400, {"success": False, "message": "Bad Request"})
+            return
+        status, payload = getattr(self.server.state, handler_name)(body, self.headers)
+        self._send(status, payload)
+
+    def _send(self, status, payload):
+        if payload is None:
+            data, content_type = b"Internal Server Error", "text/html; charset=utf-8"
+        else:
+            data, content_type = json.dumps(payload, ensure_ascii=False).encode(), "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass  # keep test output clean
+
+
+class StandInServer:
+    """Run the stand-in on a loopback port in a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0, state=None):
+        self.state = state or StandInState()
+        self._httpd = StandInHTTPServer((host, port), StandInRequestHandler)
+        self._httpd.state = self.state
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self):
+        """Serve in the calling thread until interrupted"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="stand-in", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Stellar Burgers stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    args = parser.parse_args()
+    server = StandInServer(args.host, args.port)
+    print(f"Stellar Burgers stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
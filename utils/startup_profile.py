@@ -0,0 +1,109 @@
+"""Where the time before the first test goes (--startup-profile).
+
+ImportTimer is a meta path finder that wraps the loader of every module
+imported while it is installed and times executing the module. The total
+time of a module includes the modules it imports; its own time does not.
+utils/pytest_plugin.py installs it in pytest_configure and also times
+collecting each test module; what happens before (interpreter, pytest,
+plugins, conftest.py) is reported as one CPU figure.
+"""
+import sys
+import threading
+import time
+
+
+class ImportRecord:
+    """One module executed while the timer was installed"""
+
+    __slots__ = ("name", "total", "own", "phase")
+
+    def __init__(self, name, total, own, phase):
+        self.name = name
+        self.total = total  # seconds, including the modules it imported
+        self.own = own  # seconds, excluding them
+        self.phase = phase
+
+
+class _TimedLoader:
+    """Loader proxy that times exec_module and puts the real loader back on the module"""
+
+    def __init__(self, loader, timer):
+        self.loader = loader
+        self.timer = timer
+
+    def create_module(self, spec):
+        create_module = getattr(self.loader, "create_module", None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, module):
+        # Code that inspects __loader__ (resources, source lookup, rewriting) sees the real loader
+        module.__loader__ = self.loader
+        if module.__spec__ is not None and module.__spec__.loader is self:
+            module.__spec__.loader = self.loader
+        self.timer._run(module.__name__, self.loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class ImportTimer:
+    """Meta path finder recording an ImportRecord per imported module"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-thread stack of child time of the modules being executed
+        self.records = {}  # module name -> ImportRecord, in import order
+        self.phase = None  # set by utils/pytest_plugin.py: "configure", "collection" or "tests"
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        """Find the module with the other finders and time its loader"""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _run(self, name, exec_module, module):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            total = time.perf_counter() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            with self._lock:
+                self.records[name] = ImportRecord(name, total, total - children, self.phase)
+
+    def slowest(self, count):
+        """The count imports with the longest total time"""
+        with self._lock:
+            records = list(self.records.values())
+        return sorted(records, key=lambda record: -record.total)[:count]
+
+    def clear(self):
+        with self._lock:
+            self.records = {}
+
+
+# Installed by utils/pytest_plugin.py for --startup-profile
+import_timer = ImportTimer()
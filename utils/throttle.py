@@ -0,0 +1,158 @@
+"""Client-side rate limiting and circuit breaking per service.
+
+All clients of one base URL in a process share a Throttle (see
+shared_throttle()), so parallel sessions, pool threads and async forks
+together stay under one request rate:
+
+* a token bucket of rate_limit requests per second (0 disables it), which
+  halves its rate on every 429/503 and creeps back up on successes;
+* a pause honouring Retry-After on 429 and 503, limited or not;
+* a circuit breaker that opens after breaker_threshold consecutive signs of
+  an unreachable service (502/503/504, connection errors, timeouts) and then
+  fails every request fast with ServiceUnavailableError. After breaker_reset
+  seconds one probe request is let through; its outcome closes or reopens it.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+OVERLOAD_STATUSES = (429, 503)  # slow down
+DOWN_STATUSES = (502, 503, 504)  # count towards opening the breaker
+MAX_PAUSE = 60.0  # seconds; longer Retry-After values are capped
+
+
+class ServiceUnavailableError(RuntimeError):
+    """The circuit breaker is open: the service was unreachable on the last requests"""
+
+
+def retry_after_seconds(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), None if absent or invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (moment - now).total_seconds())
+
+
+class Throttle:
+    """Adaptive token bucket plus circuit breaker, safe to share between threads"""
+
+    def __init__(self, base_url, rate_limit=0.0, burst=None, breaker_threshold=5, breaker_reset=30.0,
+                 clock=time.monotonic):
+        self.base_url = base_url
+        self.max_rate = rate_limit
+        self.min_rate = rate_limit / 20
+        self.rate = rate_limit
+        self.burst = burst or max(1.0, rate_limit)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._failures = 0
+        self._last_failure = None
+        self._opened_at = None  # set while the breaker is open
+        self._probing = False
+
+    def reserve(self):
+        """Take a request slot; return the seconds to wait before sending it.
+
+        Raises ServiceUnavailableError while the breaker is open.
+        """
+        with self._lock:
+            now = self._clock()
+            self._check_breaker(now)
+            delay = max(0.0, self._paused_until - now)
+            if self.rate:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    delay = max(delay, -self._tokens / self.rate)
+            return delay
+
+    def _check_breaker(self, now):
+        if self._opened_at is None:
+            return
+        remaining = self._opened_at + self.breaker_reset - now
+        if remaining > 0 or self._probing:
+            retry_in = max(remaining, 0.0)
+            raise ServiceUnavailableError(
+                f"{self.base_url} looks down after {self._failures} failed requests in a row "
+                f"(last: {self._last_failure}); failing fast, next attempt in {retry_in:.0f}s"
+            )
+        self._probing = True  # this request is the probe
+
+    def wait(self):
+        """Block until a request may be sent"""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    def record_response(self, status, retry_after=None):
+        with self._lock:
+            now = self._clock()
+            pause = retry_after_seconds(retry_after) if status in OVERLOAD_STATUSES else None
+            if pause:
+                self._paused_until = max(self._paused_until, now + min(pause, MAX_PAUSE))
+            if status in OVERLOAD_STATUSES and self.rate:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif status < 500 and self.rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            if status in DOWN_STATUSES:
+                self._failure(now, f"HTTP {status}")
+            else:
+                self._success()
+
+    def record_error(self, error, down=True):
+        """A request raised; down tells whether it was a connection error or a timeout"""
+        with self._lock:
+            if down:
+                self._failure(self._clock(), type(error).__name__)
+            else:
+                self._probing = False  # says nothing about the service, let another probe through
+
+    def _failure(self, now, description):
+        self._failures += 1
+        self._last_failure = description
+        if self._probing or (self.breaker_threshold and self._failures >= self.breaker_threshold):
+            self._opened_at = now
+        self._probing = False
+
+    def _success(self):
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def shared_throttle(base_url, settings):
+    """Return the process-wide throttle for base_url, creating it from settings on first use"""
+    with _throttles_lock:
+        throttle = _throttles.get(base_url)
+        if throttle is None:
+            throttle = _throttles[base_url] = Throttle(
+                base_url,
+                rate_limit=settings.rate_limit,
+                breaker_threshold=settings.breaker_threshold,
+                breaker_reset=settings.breaker_reset,
+            )
+        return throttle
@@ -0,0 +1,113 @@
+"""Access/refresh token lifecycle.
+
+The service returns a short-lived JWT access token and a refresh token on
+register and login. TokenManager keeps both per user, renews the access
+token through POST /api/auth/token shortly before it expires (or after the
+service rejects it) and never needs the password again.
+"""
+import base64
+import json
+import threading
+import time
+
+
+ACCESS_TOKEN_TTL = 20 * 60  # seconds; used when a token carries no exp claim
+
+
+def token_expiry(access_token, default_ttl=ACCESS_TOKEN_TTL):
+    """Expiry (epoch seconds) from the JWT exp claim of a 'Bearer ...' token"""
+    token = access_token.split(" ", 1)[-1]
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + default_ttl
+
+
+def token_rejected(response):
+    """True if the service refused the access token (expired or invalid)"""
+    if response.status_code == 401:
+        return True
+    if response.status_code != 403:
+        return False
+    try:
+        message = str(response.json().get("message", "")).lower()
+    except ValueError:
+        return False
+    # jsonwebtoken errors: "jwt expired", "jwt malformed", "invalid signature", "invalid token"
+    return any(word in message for word in ("jwt", "token", "signature"))
+
+
+class TokenSet:
+    """Tokens of one user"""
+
+    __slots__ = ("access_token", "refresh_token", "expires_at")
+
+    def __init__(self, access_token, refresh_token):
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.expires_at = token_expiry(access_token)
+
+
+class TokenManager:
+    """Tokens of every user a client (or several clients) act as, keyed by email"""
+
+    def __init__(self, refresh_margin=60):
+        self.refresh_margin = refresh_margin  # renew this many seconds before expiry
+        self._tokens = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def store(self, identity, access_token, refresh_token):
+        with self._lock:
+            self._tokens[identity] = TokenSet(access_token, refresh_token)
+            self._locks.setdefault(identity, threading.Lock())
+
+    def get(self, identity):
+        return self._tokens.get(identity)
+
+    def rename(self, identity, new_identity):
+        """Follow an email change"""
+        with self._lock:
+            if identity in self._tokens:
+                self._tokens[new_identity] = self._tokens.pop(identity)
+                self._locks[new_identity] = self._locks.pop(identity)
+
+    def discard(self, identity):
+        with self._lock:
+            self._tokens.pop(identity, None)
+            self._locks.pop(identity, None)
+
+    def identities(self):
+        with self._lock:
+            return list(self._tokens)
+
+    def access_token(self, identity, client):
+        """Return a valid access token, renewing it first if it is about to expire"""
+        tokens = self._tokens[identity]
+        if tokens.expires_at - time.time() < self.refresh_margin:
+            self.refresh(identity, client, stale_token=tokens.access_token)
+        return self._tokens[identity].access_token
+
+    def refresh(self, identity, client, stale_token=None):
+        """Renew the access token with the refresh token; return True on success.
+
+        Concurrent callers holding the same stale token trigger one refresh only,
+        since the service rotates refresh tokens on every use.
+        """
+        lock = self._locks.get(identity)
+        if lock is None:
+            return False
+        with lock:
+            tokens = self._tokens.get(identity)
+            if tokens is None or not tokens.refresh_token:
+                return False
+            if stale_token is not None and tokens.access_token != stale_token:
+                return True  # another thread already renewed it
+            response = client.refresh_token(tokens.refresh_token)
+            if response.status_code != 200:
+                return False
+            body = response.json()
+            self.store(identity, body["accessToken"], body["refreshToken"])
+            return True
@@ -0,0 +1,63 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.cassette import active_cassette
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout to every request"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class CassetteSession(TimeoutSession):
+    """Session that records to or replays from the active cassette"""
+
+    def request(self, method, url, **kwargs):
+        cassette = active_cassette()
+        if cassette is None:
+            return super().request(method, url, **kwargs)
+        body = kwargs.get("json")
+        if cassette.mode == "replay":
+            return cassette.play(method, url, body)
+        response = super().request(method, url, **kwargs)
+        cassette.record(method, url, body, response)
+        return response
+
+
+def build_session(settings):
+    """Create a keep-alive session with a sized connection pool and retries.
+
+    Connection errors are retried for every method since the request never
+    reached the server. Responses are not retried here: StellarBurgersAPI
+    retries 502/503/504 above its throttle, so every attempt is rate limited
+    and counted by the circuit breaker.
+    """
+    if settings.cassettes != "off":
+        session = CassetteSession(timeout=settings.timeout)
+    else:
+        session = TimeoutSession(timeout=settings.timeout)
+    retry = Retry(
+        total=settings.retries,
+        connect=settings.retries,
+        read=0,
+        status=0,
+        backoff_factor=settings.backoff_factor,
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_size,
+        pool_maxsize=settings.pool_size,
+        max_retries=retry,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -1,10 +1,69 @@
+import random
+import time
 import uuid
 
 
-def generate_unique_user():
-    """Generate a unique user payload with random email and name."""
-    unique_id = uuid.uuid4().hex  # random unique string
-    email = f"testuser_{unique_id[:8]}@yopmail.com"
+EMAIL_PREFIX = "testuser_"
+_namespace = ""
+_random = None  # seeded generator while recording/replaying cassettes
+
+
+def set_user_namespace(namespace):
+    """Prefix every generated email, e.g. with the run and worker id, so workers never collide"""
+    global _namespace
+    _namespace = f"{namespace}_" if namespace else ""
+
+
+def user_namespace():
+    """Current namespace of generated emails, with its trailing underscore ("" when none)"""
+    return _namespace
+
+
+def seed_users(seed):
+    """Make generated users reproducible (seed=None restores random users).
+
+    Returns the previous generator so that callers can restore it.
+    """
+    global _random
+    previous = _random
+    _random = seed if isinstance(seed, random.Random) or seed is None else random.Random(seed)
+    return previous
+
+
+def generate_unique_user(rng=None):
+    """Generate a unique user payload with random email and name.
+
+    rng (a random.Random) makes the payload reproducible, like seed_users().
+    """
+    rng = rng or _random
+    if rng is None:
+        unique_id = uuid.uuid4().hex  # random unique string
+    else:
+        unique_id = f"{rng.getrandbits(128):032x}"
+    email = f"{EMAIL_PREFIX}{_namespace}{unique_id[:8]}@yopmail.com"
     password = "P@ssw0rd!"  # a constant or could be randomized as well
     name = "User" + unique_id[:5]
     return {"email": email, "password": password, "name": name}
+
+
+class TrackedUser:
+    """A registered user kept for cleanup: only what deleting it takes.
+
+    The password is the same string object as in the registration payload;
+    the user's tokens live in the client's TokenManager under the email.
+    """
+
+    __slots__ = ("email", "password", "registered_at")
+
+    def __init__(self, email, password, registered_at=None):
+        self.email = email
+        self.password = password
+        self.registered_at = time.monotonic() if registered_at is None else registered_at
+
+    @classmethod
+    def of(cls, user):
+        """A TrackedUser from a TrackedUser or a user payload dict"""
+        return user if isinstance(user, cls) else cls(user["email"], user.get("password"))
+
+    def __repr__(self):
+        return f"TrackedUser({self.email!r})"
@@ -0,0 +1,73 @@
+import threading
+from contextlib import contextmanager
+
+from utils.api_client import StellarBurgersAPI
+
+
+class UserPool:
+    """Pre-registered users shared by all tests of a session (or xdist worker).
+
+    Tests lease a user instead of registering one, and every pooled user is
+    deleted once with its own token when the pool is closed. Tokens live in
+    the pool client's TokenManager and are renewed with the refresh token,
+    so long runs never log pooled users in again.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or StellarBurgersAPI()
+        self._lock = threading.Lock()
+        self._users = []  # TrackedUser of every pooled user
+        self._idle = []
+
+    def fill(self, size):
+        """Register users until the pool holds at least size of them"""
+        while len(self._users) < size:
+            user = self._register()
+            with self._lock:
+                self._idle.append(user)
+
+    def _new_client(self):
+        """A client sharing the pool's connections and tokens, safe to use from any thread"""
+        client = StellarBurgersAPI(base_url=self.client.urls.base_url, transport=self.client.session,
+                                   tokens=self.client.tokens)
+        client.hooks = list(self.client.hooks)
+        return client
+
+    def _register(self):
+        client = self._new_client()
+        response = client.register_user()
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to register pooled user: {response.status_code}")
+        # client is dropped untracked: the pool deletes its users itself in close()
+        user = client.created_users[0]
+        with self._lock:
+            self._users.append(user)
+        return user
+
+    def acquire(self):
+        """Take an idle user, registering a new one if all are leased"""
+        with self._lock:
+            user = self._idle.pop() if self._idle else None
+        return user if user is not None else self._register()
+
+    def release(self, user):
+        with self._lock:
+            self._idle.append(user)
+
+    @contextmanager
+    def lease(self):
+        """Yield a client authenticated as a pooled user"""
+        user = self.acquire()
+        client = self.client.as_user(user.email)
+        client.pooled_user = user
+        try:
+            yield client
+        finally:
+            client.cleanup_users()  # users the test registered itself
+            self.release(user)
+
+    def close(self):
+        """Delete every pooled user concurrently; report failures and return their messages (empty when all were deleted)"""
+        with self._lock:
+            users, self._users, self._idle = self._users, [], []
+        return self.client.delete_tracked(users)